@@ -0,0 +1,80 @@
+# coding=utf-8
+"""
+asyncio接口: 在协程中直接处理与通过线程池/进程池处理时的吞吐量和事件循环延迟
+事件循环延迟用一个每1ms唤醒一次的协程测量: 实际唤醒时间比预期晚了多少
+
+python benchmarks/bench_async.py [documents] [workers]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_corpus
+from ssml_parser.base.aio import AsyncSsmlNormalizer
+from ssml_parser.base.element import normalize_elements
+from ssml_parser.base.parser import SsmlParser
+from ssml_parser.normalizer.zh import ZhNormalizer
+
+
+async def ticker(lags: list, stop: asyncio.Event, interval: float = 0.001):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - expected)
+
+
+async def run_inline(corpus: list, normalizers: dict):
+    parser = SsmlParser()
+    parser.init()
+    for text in corpus:
+        root = parser.parse(text)
+        normalize_elements([root], normalizers)
+        root.merge_children()
+        # 每个文档之间让出一次事件循环
+        await asyncio.sleep(0)
+
+
+async def measure(name: str, corpus: list, work):
+    lags = []
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+    start = time.perf_counter()
+    await work()
+    seconds = time.perf_counter() - start
+    stop.set()
+    await tick
+    lags.sort()
+    p99 = lags[int(0.99 * (len(lags) - 1))] if lags else 0.0
+    worst = lags[-1] if lags else 0.0
+    print(f"{name:8s} {len(corpus) / seconds:8.1f} docs/s  loop lag p99={1000 * p99:7.2f}ms max={1000 * worst:7.2f}ms")
+
+
+async def main_async(corpus: list, workers: int):
+    normalizers = {"zh-CN": ZhNormalizer()}
+    await measure("inline", corpus, lambda: run_inline(corpus, normalizers))
+    for executor in ("thread", "process"):
+        async with AsyncSsmlNormalizer(normalizers, executor=executor, workers=workers) as runner:
+            # 预热工作线程/进程
+            await asyncio.gather(*(runner.normalize_ssml(text) for text in corpus[:workers]))
+
+            async def work():
+                await asyncio.gather(*(runner.normalize_ssml(text) for text in corpus))
+
+            await measure(executor, corpus, work)
+
+
+def main():
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    corpus = generate_corpus(documents, paragraphs=4)
+    ZhNormalizer().warmup()
+    asyncio.run(main_async(corpus, workers))
+
+
+if __name__ == "__main__":
+    main()
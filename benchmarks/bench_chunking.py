@@ -0,0 +1,52 @@
+# coding=utf-8
+"""
+长文本按句切分后交给模型: 不同文本长度下整段处理, 切分处理和切分后多线程处理的耗时
+
+python benchmarks/bench_chunking.py
+"""
+import importlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+zh_normalize = importlib.import_module("ssml_parser.normalizer.zh.normalize")
+
+SENTENCES = [
+    "今天是2023年10月15日，气温是25度。", "会议在10:30开始，请准时到达！",
+    "价格为100元，折扣为20%。", "这部分语速较慢，包含数字654；", "比分是3:1，太精彩了？\n",
+]
+CONFIGS = [("whole", 0, 0), ("chunked", 200, 0), ("chunked x4", 200, 4)]
+
+
+def build_text(chars: int) -> str:
+    text = ""
+    i = 0
+    while len(text) < chars:
+        text += SENTENCES[i % len(SENTENCES)]
+        i += 1
+    return text
+
+
+def run(chars: int, max_chars: int, workers: int):
+    zh_normalize.warmup()
+    zh_normalize.set_chunking(max_chars, workers)
+    text = build_text(chars)
+    start = time.perf_counter()
+    result = zh_normalize.plain_normalize(text)
+    return time.perf_counter() - start, result
+
+
+def main():
+    for chars in (1000, 4000, 16000):
+        expected = None
+        for name, max_chars, workers in CONFIGS:
+            seconds, result = run(chars, max_chars, workers)
+            assert expected is None or result == expected
+            expected = result
+            print(f"chars={chars:6d} {name:11s} time={1000 * seconds:9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# coding=utf-8
+"""
+电话号码/nominal/年份逐位读: str.translate查表实现与原逐字符实现的耗时对比
+
+python benchmarks/bench_digit_readers.py
+"""
+import os
+import random
+import re
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ssml_parser.normalizer.zh.normalize import telephone_normalize, nominal_normalize
+from ssml_parser.normalizer.zh.tools import integer_to_chinese, digits_to_chinese
+
+
+def reference_phone_normalize(text: str):
+    if len(text) <= 5:
+        return "".join(integer_to_chinese(c) for c in text)
+    if len(text) % 4 == 0:
+        return " ".join(reference_phone_normalize(text[i:i+4]) for i in range(0, len(text), 4))
+    if len(text) % 4 == 1:
+        return "".join(integer_to_chinese(c) for c in text[:5]) + " " + reference_phone_normalize(text[5:])
+    if len(text) % 4 == 2:
+        return ("".join(integer_to_chinese(c) for c in text[:3]) + " " +
+                "".join(integer_to_chinese(c) for c in text[3:6]) + " " + reference_phone_normalize(text[6:]))
+    return "".join(integer_to_chinese(c) for c in text[:3]) + " " + reference_phone_normalize(text[3:])
+
+
+def reference_telephone_normalize(text: str):
+    numbers = re.findall(r"\d+", text)
+    return " ".join(reference_phone_normalize(num).strip() for num in numbers).replace("一", "幺")
+
+
+def reference_nominal_normalize(text: str):
+    result = ""
+    for c in text:
+        if c.isdigit():
+            result += integer_to_chinese(c)
+        elif c.lower() in "qwertyuiopasdfghjklzxcvbnm":
+            result += f" {c} "
+        elif c in string.punctuation:
+            result += " "
+        else:
+            result += c
+    return re.sub(r"\s+", " ", result).replace("一", "幺")
+
+
+def reference_year(year: str):
+    return "".join([integer_to_chinese(x) for x in year])
+
+
+def build_inputs(seed: int = 0):
+    rng = random.Random(seed)
+    phones = []
+    for _ in range(20000):
+        phones.append(rng.choice([
+            "1" + "".join(rng.choice(string.digits) for _ in range(10)),
+            "0" + "".join(rng.choice(string.digits) for _ in range(2)) + "-" + "".join(rng.choice(string.digits) for _ in range(8)),
+            "400-" + "".join(rng.choice(string.digits) for _ in range(3)) + "-" + "".join(rng.choice(string.digits) for _ in range(4)),
+        ]))
+    nominals = ["".join(rng.choice(string.ascii_uppercase + string.digits + "-") for _ in range(rng.randint(3, 12)))
+                for _ in range(20000)]
+    years = [str(rng.randint(1900, 2100)) for _ in range(20000)]
+    return phones, nominals, years
+
+
+def main():
+    phones, nominals, years = build_inputs()
+    cases = [
+        ("phone", phones, reference_telephone_normalize, telephone_normalize),
+        ("nominal", nominals, reference_nominal_normalize, nominal_normalize),
+        ("year", years, reference_year, digits_to_chinese),
+    ]
+    for name, inputs, reference, current in cases:
+        assert [reference(text) for text in inputs] == [current(text) for text in inputs]
+        before = timeit.timeit(lambda: [reference(text) for text in inputs], number=3) / 3
+        after = timeit.timeit(lambda: [current(text) for text in inputs], number=3) / 3
+        print(f"{name:8s} reference={1e6 * before / len(inputs):6.2f}us "
+              f"translate={1e6 * after / len(inputs):6.2f}us speedup={before / after:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
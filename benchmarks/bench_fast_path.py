@@ -0,0 +1,65 @@
+# coding=utf-8
+"""
+plain_normalize 快速路径: 混合语料上跳过模型的文本比例, 交给模型的字符比例, 以及与整段交给模型相比的耗时
+
+python benchmarks/bench_fast_path.py
+"""
+import importlib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+zh_normalize = importlib.import_module("ssml_parser.normalizer.zh.normalize")
+
+SENTENCES = [
+    "技术正在快速发展。", "这部分语速较慢，请仔细听。", "我们明天一起去公园散步吧！",
+    "这个问题需要进一步研究；请大家提出意见。", "“好的”，他说。", "你们觉得怎么样？",
+    "今天是2023年10月15日，气温是25度。", "会议在10:30开始，请准时到达。",
+    "价格为100元，折扣为20%。", "他說的話很有道理。", "我们一起去玩儿吧！", "呃，我不知道。",
+]
+
+
+def build_corpus(size: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return ["".join(rng.choice(SENTENCES) for _ in range(rng.randint(1, 6))) for _ in range(size)]
+
+
+def main():
+    corpus = build_corpus(500)
+    model = zh_normalize.get_zh_tn_model()
+    zh_normalize.get_text_scanner()
+
+    calls = []
+    original = model.normalize
+
+    def counting_normalize(text):
+        calls.append(text)
+        return original(text)
+
+    start = time.perf_counter()
+    expected = [original(text) for text in corpus]
+    full_seconds = time.perf_counter() - start
+
+    model.normalize = counting_normalize
+    try:
+        start = time.perf_counter()
+        results = [zh_normalize.plain_normalize(text) for text in corpus]
+        fast_seconds = time.perf_counter() - start
+    finally:
+        del model.normalize
+    assert results == expected
+
+    skipped = sum(not zh_normalize.get_text_scanner().needs_model(text) for text in corpus)
+    total_chars = sum(len(text) for text in corpus)
+    model_chars = sum(len(text) for text in calls)
+    print(f"texts={len(corpus)} skipped={skipped} ({100 * skipped / len(corpus):.1f}%) model calls={len(calls)}")
+    print(f"chars={total_chars} sent to model={model_chars} ({100 * model_chars / total_chars:.1f}%)")
+    print(f"full={1000 * full_seconds:.1f}ms fast path={1000 * fast_seconds:.1f}ms "
+          f"speedup={full_seconds / fast_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# coding=utf-8
+"""
+深层嵌套文档上的继承属性解析(xml:lang)耗时
+
+python benchmarks/bench_inherited.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ssml_parser.base.parser import SsmlParser
+from ssml_parser.base.normalizer import Normalizer
+
+
+def build_document(depth: int, leaves_per_level: int = 10) -> str:
+    text = "".join(f'<say-as interpret-as="cardinal">{i}</say-as>文本' for i in range(leaves_per_level))
+    opening = "".join(
+        f'<voice name="v{i}">{text}' if i % 2 else f'<prosody rate="{i}%">{text}' for i in range(depth)
+    )
+    closing = "".join("</voice>" if i % 2 else "</prosody>" for i in reversed(range(depth)))
+    return f'<speak xml:lang="zh-CN">{opening}{closing}</speak>'
+
+
+def main():
+    parser = SsmlParser()
+    parser.init()
+    normalizers = {"zh-CN": Normalizer()}
+    for depth in (10, 100, 400):
+        text = build_document(depth)
+        runs = 5
+        seconds = timeit.timeit(lambda: parser.parse(text).normalize(normalizers), number=runs) / runs
+        parse_seconds = timeit.timeit(lambda: parser.parse(text), number=runs) / runs
+        leaves = depth * 20
+        print(f"depth={depth:4d} leaves={leaves:6d} normalize={1000 * (seconds - parse_seconds):8.2f}ms "
+              f"per leaf={1e6 * (seconds - parse_seconds) / leaves:6.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# coding=utf-8
+"""
+integer_to_chinese 查表实现与原逐位转换实现的耗时对比
+
+python benchmarks/bench_integer_to_chinese.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ssml_parser.normalizer.zh.tools import (
+    CN_DIGITS, _i2c_8digit, _clean_normed_number, integer_to_chinese, integer_to_chinese_many
+)
+
+
+def reference_integer_to_chinese(num: str):
+    # 原实现: 补齐到16位后逐段拼接, 再多次replace
+    int(num)
+    result = ""
+    if num[0] == "-":
+        result += "负"
+        num = num[1:]
+    if len(num) == 1:
+        return result + CN_DIGITS[num]
+    if len(num) > 16:
+        raise ValueError(f"num {num} is bigger than 10^16")
+    num = ("0" * 16 + num)[-16:]
+    result = _i2c_8digit(num[:8])
+    if result:
+        result += "亿"
+        if num[7] == "0" or num[8] == "0":
+            result += "零"
+    result += _i2c_8digit(num[8:16])
+    return _clean_normed_number(result) if result else "零"
+
+
+def build_inputs(count: int, max_length: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [str(rng.randrange(10 ** rng.randint(1, max_length))) for _ in range(count)]
+
+
+def main():
+    for name, max_length in (("digit", 1), ("date/time", 2), ("cardinal", 6), ("large", 16)):
+        nums = build_inputs(100000, max_length)
+        assert [reference_integer_to_chinese(num) for num in nums] == integer_to_chinese_many(nums)
+        reference = timeit.timeit(lambda: [reference_integer_to_chinese(num) for num in nums], number=3) / 3
+        table = timeit.timeit(lambda: [integer_to_chinese(num) for num in nums], number=3) / 3
+        many = timeit.timeit(lambda: integer_to_chinese_many(nums), number=3) / 3
+        print(f"{name:10s} reference={1e9 * reference / len(nums):7.0f}ns "
+              f"table={1e9 * table / len(nums):6.0f}ns many={1e9 * many / len(nums):6.0f}ns "
+              f"speedup={reference / table:5.1f}x/{reference / many:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
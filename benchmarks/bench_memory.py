@@ -0,0 +1,65 @@
+# coding=utf-8
+"""
+解析后SSML树的内存占用: 每个节点的字节数和GC跟踪的对象数
+
+python benchmarks/bench_memory.py [段落数]
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ssml_parser.base.parser import SsmlParser
+from ssml_parser.base.element import SsmlNodeElement
+
+
+def build_document(paragraphs: int) -> str:
+    parts = ['<speak xml:lang="zh-CN">']
+    for i in range(paragraphs):
+        parts.append(
+            f'<voice name="narrator"><prosody rate="medium">第{i}段，今天是2023年10月15日，'
+            f'<say-as interpret-as="cardinal">{i}</say-as>个人。'
+            f'<break time="200ms"/><sub alias="人工智能">AI</sub>技术。</prosody></voice>'
+        )
+    parts.append("</speak>")
+    return "".join(parts)
+
+
+def count_nodes(node) -> int:
+    if isinstance(node, SsmlNodeElement):
+        return 1 + sum(count_nodes(child) for child in node.children)
+    return 1
+
+
+def main():
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    text = build_document(paragraphs)
+    parser = SsmlParser()
+    parser.init()
+
+    gc.collect()
+    tracked = len(gc.get_objects())
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    root = parser.parse(text)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    tracked = len(gc.get_objects()) - tracked
+
+    nodes = count_nodes(root)
+    print(f"nodes: {nodes}")
+    print(f"bytes: {after - before}")
+    print(f"bytes/node: {(after - before) / nodes:.1f}")
+    print(f"gc tracked objects/node: {tracked / nodes:.2f}")
+
+    gc.disable()
+    del root
+    print(f"objects left for cyclic gc after del: {gc.collect()}")
+    gc.enable()
+
+
+if __name__ == "__main__":
+    main()
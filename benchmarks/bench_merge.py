@@ -0,0 +1,41 @@
+# coding=utf-8
+"""
+merge_children 在不同长度的可合并叶子序列(文本/say-as/sub交替)上的耗时
+
+python benchmarks/bench_merge.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ssml_parser.base.parser import SsmlParser
+
+
+def build_document(run_length: int) -> str:
+    leaves = []
+    for i in range(run_length):
+        if i % 3 == 0:
+            leaves.append(f"这是第{i}句普通文本，")
+        elif i % 3 == 1:
+            leaves.append(f'<say-as interpret-as="cardinal">{i}</say-as>')
+        else:
+            leaves.append(f'<sub alias="人工智能{i}">AI</sub>')
+    return f'<speak xml:lang="zh-CN">{"".join(leaves)}</speak>'
+
+
+def main():
+    parser = SsmlParser()
+    parser.init()
+    for run_length in (1000, 4000, 16000, 64000):
+        text = build_document(run_length)
+        runs = 3
+        roots = [parser.parse(text) for _ in range(runs)]
+        seconds = timeit.timeit(lambda: roots.pop().merge_children(), number=runs) / runs
+        print(f"run length={run_length:6d} merge={1000 * seconds:9.2f}ms "
+              f"per leaf={1e6 * seconds / run_length:6.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# coding=utf-8
+"""
+SsmlParser后端对比: ElementTree+转换 与 expat事件直接建树(str和bytes输入), 文档大小从1KB到10MB
+
+python benchmarks/bench_parser_backend.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_corpus
+from ssml_parser.base.element import SsmlLeafElement
+from ssml_parser.base.parser import SsmlParser
+
+
+def dump(root):
+    result = []
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if isinstance(node, SsmlLeafElement):
+            result.append((depth, type(node).__name__, node.attrs, node.text))
+        else:
+            result.append((depth, type(node).__name__, node.attrs))
+            stack.extend((child, depth + 1) for child in reversed(node.children))
+    return result
+
+
+def document(size: int) -> str:
+    # 每段约400字节, 按目标大小调整段落数
+    return generate_corpus(1, max(1, size // 400), depth=3)[0]
+
+
+def main():
+    parsers = {}
+    for backend in ("etree", "expat"):
+        parsers[backend] = SsmlParser(backend=backend)
+        parsers[backend].init()
+    for size in (1 << 10, 10 << 10, 100 << 10, 1 << 20, 10 << 20):
+        text = document(size)
+        data = text.encode("utf-8")
+        assert dump(parsers["etree"].parse(text)) == dump(parsers["expat"].parse(text)) == \
+               dump(parsers["expat"].parse(data))
+        number = max(1, (1 << 20) // len(data))
+        cases = [
+            ("etree", lambda: parsers["etree"].parse(text)),
+            ("expat", lambda: parsers["expat"].parse(text)),
+            ("expat/bytes", lambda: parsers["expat"].parse(data)),
+        ]
+        times = {name: min(timeit.repeat(func, number=number, repeat=3)) / number for name, func in cases}
+        print(f"{len(data) / 1024:9.1f}KB " + "  ".join(
+            f"{name}={1000 * seconds:9.2f}ms ({len(data) / seconds / 1e6:5.1f}MB/s)" for name, seconds in times.items()) +
+            f"  speedup={times['etree'] / times['expat']:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# coding=utf-8
+"""
+process(一次遍历正则化并合并) 与 normalize + merge_children 两次遍历的耗时对比
+identity: 不修改文本的Normalizer, 只测量遍历和合并; zh: ZhNormalizer端到端
+
+python benchmarks/bench_process.py [--zh]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_corpus
+from ssml_parser.base.element import SsmlLeafElement, normalize_elements, process_elements
+from ssml_parser.base.normalizer import Normalizer
+from ssml_parser.base.parser import SsmlParser
+
+
+class IdentityNormalizer(Normalizer):
+    language = "zh-CN"
+
+    def normalize(self, text: str, attrs: dict = None):
+        return text
+
+
+def dump(root):
+    result = []
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if isinstance(node, SsmlLeafElement):
+            result.append((depth, type(node).__name__, node.attrs, node.text))
+        else:
+            result.append((depth, type(node).__name__, node.attrs))
+            stack.extend((child, depth + 1) for child in reversed(node.children))
+    return result
+
+
+def two_step(roots: list, normalizers: dict):
+    normalize_elements(roots, normalizers)
+    for root in roots:
+        root.merge_children()
+
+
+def measure(parser: SsmlParser, corpus: list, normalizers: dict, repeat: int) -> dict:
+    times = {}
+    for name, func in (("two-step", two_step), ("process", process_elements)):
+        # 正则化和合并会修改树, 每次重复使用新解析的树
+        inputs = [[parser.parse(text) for text in corpus] for _ in range(repeat)]
+        times[name] = min(timeit.repeat(lambda: func(inputs.pop(), normalizers), number=1, repeat=repeat))
+    return times
+
+
+def main():
+    parser = SsmlParser()
+    parser.init()
+    corpora = [
+        ("corpus depth=2", generate_corpus(200, 10, depth=2)),
+        ("corpus depth=6", generate_corpus(200, 10, depth=6)),
+    ]
+    normalizer_sets = [("identity", {"zh-CN": IdentityNormalizer()}, 5)]
+    if "--zh" in sys.argv:
+        from ssml_parser.normalizer.zh import ZhNormalizer
+        ZhNormalizer().warmup()
+        normalizer_sets.append(("zh", {"zh-CN": ZhNormalizer()}, 3))
+
+    for name, corpus in corpora:
+        expected = [parser.parse(text) for text in corpus]
+        results = [parser.parse(text) for text in corpus]
+        two_step(expected, normalizer_sets[0][1])
+        process_elements(results, normalizer_sets[0][1])
+        assert [dump(root) for root in results] == [dump(root) for root in expected]
+        for normalizer_name, normalizers, repeat in normalizer_sets:
+            times = measure(parser, corpus, normalizers, repeat)
+            print(f"{name:16s} {normalizer_name:8s} two-step={1000 * times['two-step']:8.2f}ms "
+                  f"process={1000 * times['process']:8.2f}ms speedup={times['two-step'] / times['process']:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
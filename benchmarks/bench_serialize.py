@@ -0,0 +1,81 @@
+# coding=utf-8
+"""
+SSML序列化: to_ssml/write_ssml与先转换为ElementTree再ET.tostring的耗时对比
+输入为解析并merge_children后的文档, 三种方式的输出重新解析后结果相同
+
+python benchmarks/bench_serialize.py
+"""
+import io
+import os
+import sys
+import tempfile
+import timeit
+from xml.etree import ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_corpus
+from ssml_parser.base.element import SsmlNodeElement
+from ssml_parser.base.parser import SsmlParser
+
+
+def to_element_tree(root) -> ET.Element:
+    """
+    SsmlElement树转换为ElementTree, 普通文本作为前一个元素的tail或父元素的text
+    """
+    result = ET.Element(root.tag_name(), dict(root.attrs))
+    stack = [(root, result)]
+    while stack:
+        node, et_node = stack.pop()
+        last = None
+        for child in node.children:
+            if child.tag_name() == "_plain":
+                if last is None:
+                    et_node.text = (et_node.text or "") + child.text
+                else:
+                    last.tail = (last.tail or "") + child.text
+                continue
+            last = ET.SubElement(et_node, child.tag_name(), dict(child.attrs))
+            if isinstance(child, SsmlNodeElement):
+                stack.append((child, last))
+            elif child.text:
+                last.text = child.text
+    return result
+
+
+def et_tostring(root) -> str:
+    return ET.tostring(to_element_tree(root), encoding="unicode")
+
+
+def main():
+    parser = SsmlParser()
+    parser.init()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "out.ssml")
+        for paragraphs in (10, 100, 1000, 10000):
+            root = parser.parse(generate_corpus(1, paragraphs, depth=3)[0])
+            root.merge_children()
+            expected = root.to_ssml()
+            assert ET.tostring(ET.fromstring(et_tostring(root)), encoding="unicode") == \
+                   ET.tostring(ET.fromstring(expected), encoding="unicode")
+
+            def write_file():
+                with open(path, "w", encoding="utf-8") as f:
+                    root.write_ssml(f)
+
+            number = max(1, 1000 // paragraphs)
+            cases = [
+                ("ET.tostring", lambda: et_tostring(root)),
+                ("to_ssml", root.to_ssml),
+                ("write_ssml/StringIO", lambda: root.write_ssml(io.StringIO())),
+                ("write_ssml/file", write_file),
+            ]
+            times = {name: min(timeit.repeat(func, number=number, repeat=3)) / number for name, func in cases}
+            print(f"{len(expected.encode('utf-8')) / 1024:9.1f}KB " + "  ".join(
+                f"{name}={1000 * seconds:8.2f}ms" for name, seconds in times.items()) +
+                f"  speedup={times['ET.tostring'] / times['to_ssml']:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
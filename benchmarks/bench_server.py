@@ -0,0 +1,106 @@
+# coding=utf-8
+"""
+本地正则化服务的压力测试: 多个线程并发提交SSML文档, 对比进程内处理与通过服务处理的吞吐量和延迟
+服务在子进程中运行, 输出中还包括服务端的批大小和队列深度统计
+
+python benchmarks/bench_server.py [documents] [threads] [max_wait_ms]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_corpus
+from ssml_parser.base.client import NormalizerClient
+from ssml_parser.base.element import normalize_elements
+from ssml_parser.base.parser import SsmlParser
+
+
+def load_test(name: str, corpus: list, threads: int, process):
+    latencies = []
+    lock = threading.Lock()
+
+    def run(text):
+        start = time.perf_counter()
+        process(text)
+        seconds = time.perf_counter() - start
+        with lock:
+            latencies.append(seconds)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(run, corpus))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[int(0.99 * (len(latencies) - 1))]
+    print(f"{name:10s} {len(corpus) / seconds:8.1f} docs/s  latency p50={1000 * p50:7.2f}ms p99={1000 * p99:7.2f}ms")
+
+
+def wait_for_server(address: str, server: subprocess.Popen, timeout: float = 300):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("normalization server exited")
+        try:
+            NormalizerClient(address).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("normalization server did not start")
+
+
+def main():
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    max_wait_ms = sys.argv[3] if len(sys.argv) > 3 else "2"
+    corpus = generate_corpus(documents, paragraphs=4)
+
+    from ssml_parser.normalizer.zh import ZhNormalizer
+    parser = SsmlParser()
+    parser.init()
+    normalizers = {"zh-CN": ZhNormalizer()}
+    ZhNormalizer().warmup()
+
+    def in_process(text):
+        root = parser.parse(text)
+        normalize_elements([root], normalizers)
+        root.merge_children()
+
+    load_test("in-process", corpus, threads, in_process)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        address = os.path.join(tmp_dir, "normalizer.sock")
+        server = subprocess.Popen(
+            [sys.executable, "-m", "ssml_parser.base.server", "--unix", address, "--max-wait-ms", max_wait_ms],
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_server(address, server)
+            local = threading.local()
+
+            def via_server(text):
+                client = getattr(local, "client", None)
+                if client is None:
+                    client = local.client = NormalizerClient(address)
+                client.normalize_ssml(text)
+
+            load_test("server", corpus, threads, via_server)
+            with NormalizerClient(address) as client:
+                stats = client.stats()
+            print(f"server stats: batches={stats['batches']} mean_batch_size={stats['mean_batch_size']:.1f} "
+                  f"max_batch_size={stats['max_batch_size']} max_queue_depth={stats['max_queue_depth']} "
+                  f"mean_wait_ms={stats['mean_wait_ms']:.2f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
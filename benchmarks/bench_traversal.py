@@ -0,0 +1,86 @@
+# coding=utf-8
+"""
+parse/normalize/merge_children: 显式栈实现与递归实现在宽树和深树上的对比
+
+python benchmarks/bench_traversal.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xml.etree import ElementTree as ET
+from ssml_parser.base.parser import SsmlParser
+from ssml_parser.base.element import SsmlNodeElement, PlainText
+from ssml_parser.base.normalizer import Normalizer
+
+
+def recursive_parse(parser: SsmlParser, text: str):
+    def parse_element(parent, root, namespaces, attrs_table):
+        element = parser._create_element(parent, root, namespaces, attrs_table)
+        if isinstance(element, SsmlNodeElement):
+            for child_node in root:
+                element.children.append(parse_element(element, child_node, namespaces, attrs_table))
+                if child_node.tail:
+                    element.children.append(PlainText(parent=element, attrs={}, text=child_node.tail))
+        namespaces.pop(-1)
+        return element
+    return parse_element(None, ET.fromstring(text), [dict(ns) for ns in parser.namespaces], {})
+
+
+def recursive_normalize(node, normalizers):
+    for child in node.children:
+        if isinstance(child, SsmlNodeElement):
+            recursive_normalize(child, normalizers)
+        else:
+            child.normalize(normalizers)
+
+
+def recursive_merge(node):
+    for child in node.children:
+        if isinstance(child, SsmlNodeElement):
+            recursive_merge(child)
+    node._merge_own_children()
+
+
+def build_wide(paragraphs: int) -> str:
+    body = "".join(
+        f'<voice name="v">段落{i}<say-as interpret-as="cardinal">{i}</say-as>结束。</voice>' for i in range(paragraphs)
+    )
+    return f'<speak xml:lang="zh-CN">{body}</speak>'
+
+
+def build_deep(depth: int) -> str:
+    opening = "".join(f'<prosody rate="{i}%">文本<say-as interpret-as="cardinal">{i}</say-as>' for i in range(depth))
+    return f'<speak xml:lang="zh-CN">{opening}{"</prosody>" * depth}</speak>'
+
+
+def bench(func, runs: int = 5) -> str:
+    try:
+        return f"{1000 * timeit.timeit(func, number=runs) / runs:8.2f}ms"
+    except RecursionError:
+        return "RecursionError"
+
+
+def main():
+    parser = SsmlParser()
+    parser.init()
+    normalizers = {"zh-CN": Normalizer()}
+    for name, text in [
+        ("wide 5000", build_wide(5000)),
+        ("deep 500", build_deep(500)),
+        ("deep 5000", build_deep(5000)),
+    ]:
+        root = parser.parse(text)
+        print(name)
+        print(f"  parse      iterative {bench(lambda: parser.parse(text))}  "
+              f"recursive {bench(lambda: recursive_parse(parser, text))}")
+        print(f"  normalize  iterative {bench(lambda: root.normalize(normalizers))}  "
+              f"recursive {bench(lambda: recursive_normalize(root, normalizers))}")
+        print(f"  merge      iterative {bench(lambda: parser.parse(text).merge_children())}  "
+              f"recursive {bench(lambda: recursive_merge(parser.parse(text)))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# coding=utf-8
+"""
+对比两次 benchmarks/suite.py 的JSON结果, 列出各项耗时/内存及变化比例
+
+python benchmarks/compare.py before.json after.json
+"""
+import json
+import sys
+
+# 对比的指标(均为越小越好)
+METRIC_SUFFIXES = ("total_s", "import_s", "warmup_s", "us_per_call", "us_per_document", "_mb")
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    items = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            items.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and key.endswith(METRIC_SUFFIXES):
+            items[name] = value
+    return items
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__.strip())
+        sys.exit(1)
+    reports = []
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as f:
+            reports.append(json.load(f))
+    before, after = (flatten(report["results"]) for report in reports)
+    print(f"{'metric':45s} {reports[0]['meta']['commit'] or 'before':>12s} {reports[1]['meta']['commit'] or 'after':>12s}  change")
+    for name in sorted(set(before) | set(after)):
+        old, new = before.get(name), after.get(name)
+        change = f"{100 * (new - old) / old:+7.1f}%" if old and new is not None else ""
+        old = f"{old:12.4f}" if old is not None else f"{'-':>12s}"
+        new = f"{new:12.4f}" if new is not None else f"{'-':>12s}"
+        print(f"{name:45s} {old} {new}  {change}")
+
+
+if __name__ == "__main__":
+    main()
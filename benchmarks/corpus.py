@@ -0,0 +1,131 @@
+# coding=utf-8
+"""
+确定性的SSML合成语料: 相同参数和seed总是生成相同的文档
+"""
+import random
+from xml.sax.saxutils import escape, quoteattr
+
+
+SENTENCES = [
+    "今天是2023年10月15日，气温是25度。", "技术正在快速发展。", "这部分语速较慢，请仔细听。",
+    "会议在10:30开始，请准时到达！", "价格为100元，折扣为20%。", "我们明天一起去公园散步吧。",
+    "这个问题需要进一步研究；请大家提出意见。", "比分是3:1，太精彩了？",
+]
+
+
+def _date(rng):
+    return f"{rng.randint(1990, 2030)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", None
+
+
+def _date_format(rng):
+    return f"{rng.randint(1990, 2030)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}", "Ymd"
+
+
+def _time(rng):
+    return f"{rng.randint(0, 23)}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}", None
+
+
+def _time_format(rng):
+    return f"{rng.randint(0, 23):02d}{rng.randint(0, 59):02d}{rng.randint(0, 59):02d}", "hMs"
+
+
+def _phone(rng):
+    return "1" + "".join(rng.choice("0123456789") for _ in range(10)), None
+
+
+def _nominal(rng):
+    return rng.choice("ABCDEFG") + str(rng.randint(1, 999)) + "-" + str(rng.randint(1, 99)), None
+
+
+def _cardinal(rng):
+    return f"{rng.randint(0, 10 ** rng.randint(1, 8)):,}", None
+
+
+def _ordinal(rng):
+    return f"第{rng.randint(1, 200)}章", None
+
+
+def _email(rng):
+    return f"user{rng.randint(1, 999)}@example.com", None
+
+
+# say-as 类型 -> 生成 (文本, format) 的函数, 带":format"的类型使用显式format
+SAY_AS_GENERATORS = {
+    "date": _date,
+    "date:format": _date_format,
+    "time": _time,
+    "time:format": _time_format,
+    "phone": _phone,
+    "nominal": _nominal,
+    "cardinal": _cardinal,
+    "ordinal": _ordinal,
+    "email": _email,
+}
+
+
+def parse_mix(mix: str) -> dict:
+    """
+    解析say-as比例, 如 "date=2,cardinal=1", 空字符串表示所有类型比例相同
+    """
+    if not mix:
+        return {name: 1.0 for name in SAY_AS_GENERATORS}
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        if name not in SAY_AS_GENERATORS:
+            raise ValueError(f"Unknown say-as type: {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def _say_as(rng, names: list, weights: list) -> str:
+    name = rng.choices(names, weights)[0]
+    text, dformat = SAY_AS_GENERATORS[name](rng)
+    interpret_as = name.split(":")[0]
+    attrs = f"interpret-as={quoteattr(interpret_as)}"
+    if dformat:
+        attrs += f" format={quoteattr(dformat)}"
+    return f"<say-as {attrs}>{escape(text)}</say-as>"
+
+
+def _paragraph(rng, depth: int, names: list, weights: list) -> str:
+    opening = []
+    closing = []
+    for level in range(depth):
+        kind = level % 3
+        if kind == 0:
+            opening.append(f'<voice name="speaker{rng.randint(1, 3)}">')
+            closing.append("</voice>")
+        elif kind == 1:
+            opening.append(f'<prosody rate="{rng.choice(["slow", "medium", "fast"])}">')
+            closing.append("</prosody>")
+        else:
+            opening.append('<lang xml:lang="zh-CN">')
+            closing.append("</lang>")
+    content = []
+    for _ in range(rng.randint(2, 5)):
+        content.append(rng.choice(SENTENCES))
+        content.append(_say_as(rng, names, weights))
+    if rng.random() < 0.5:
+        content.append(f'<break time="{rng.choice([100, 200, 500])}ms"/>')
+    if rng.random() < 0.5:
+        content.append('<sub alias="人工智能">AI</sub>技术。')
+    return "".join(opening) + "".join(content) + "".join(reversed(closing))
+
+
+def generate_document(rng: random.Random, paragraphs: int, depth: int, mix: dict) -> str:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    body = "".join(_paragraph(rng, depth, names, weights) for _ in range(paragraphs))
+    return f'<speak xml:lang="zh-CN">{body}</speak>'
+
+
+def generate_corpus(documents: int = 100, paragraphs: int = 10, depth: int = 2, mix: str = "",
+                    seed: int = 0) -> list[str]:
+    """
+    documents: 文档数; paragraphs: 每个文档的段落数; depth: 每段外层voice/prosody/lang的嵌套层数
+    mix: say-as类型比例, 参考 parse_mix
+    """
+    rng = random.Random(seed)
+    weights = parse_mix(mix)
+    return [generate_document(rng, paragraphs, depth, weights) for _ in range(documents)]
@@ -0,0 +1,201 @@
+# coding=utf-8
+"""
+基准测试套件: 在合成语料上测量解析, 各interpret-as分支的正则化, merge_children, 端到端处理,
+冷启动耗时和峰值内存, 结果输出为JSON, 可用 benchmarks/compare.py 对比同一台机器上不同提交的结果
+
+python benchmarks/suite.py --output before.json
+python benchmarks/suite.py --documents 200 --depth 4 --mix date=2,cardinal=1 --output after.json
+python benchmarks/compare.py before.json after.json
+"""
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_corpus
+
+STARTUP_CODE = """
+import importlib, json, time
+start = time.perf_counter()
+normalize = importlib.import_module("ssml_parser.normalizer.zh.normalize")
+imported = time.perf_counter()
+normalize.warmup()
+print(json.dumps({"import_s": imported - start, "warmup_s": time.perf_counter() - imported,
+                  "build_times": normalize.build_times}))
+"""
+
+
+def timed(func, repeat: int) -> float:
+    """
+    运行func repeat次, 返回最短耗时(秒)
+    """
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def bench_startup(repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", STARTUP_CODE], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    best = min(runs, key=lambda run: run["import_s"] + run["warmup_s"])
+    return best
+
+
+def collect_leaves(roots: list) -> dict:
+    """
+    按 (interpret-as, 是否有format) 分组的叶子文本和属性, 没有interpret-as的文本归入plain
+    """
+    from ssml_parser.base.element import PlainText, SayAs
+    groups = {}
+    for root in roots:
+        for leaf in root.iter_leaves():
+            if isinstance(leaf, SayAs):
+                interpret_as = leaf.attrs.get("interpret-as") or "plain"
+                name = interpret_as + (":format" if leaf.attrs.get("format") else "")
+            elif isinstance(leaf, PlainText):
+                name = "plain"
+            else:
+                continue
+            groups.setdefault(name, []).append((leaf.text, leaf.attrs))
+    return groups
+
+
+def bench_normalize(groups: dict, repeat: int, limit: int) -> dict:
+    zh_normalize = importlib.import_module("ssml_parser.normalizer.zh.normalize")
+    results = {}
+    for name in sorted(groups):
+        items = groups[name][:limit]
+        interpret_as = "" if name == "plain" else name.split(":")[0]
+
+        def run():
+            for text, attrs in items:
+                zh_normalize.normalize(text, interpret_as, attrs)
+
+        run()
+        seconds = timed(run, repeat)
+        results[name] = {
+            "calls": len(items),
+            "chars": sum(len(text) for text, _ in items),
+            "total_s": seconds,
+            "us_per_call": 1e6 * seconds / len(items),
+        }
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--documents", type=int, default=100)
+    arg_parser.add_argument("--paragraphs", type=int, default=10)
+    arg_parser.add_argument("--depth", type=int, default=2, help="每段外层元素的嵌套层数")
+    arg_parser.add_argument("--mix", default="", help="say-as类型比例, 如 date=2,cardinal=1")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--repeat", type=int, default=3, help="每项重复次数, 取最短耗时")
+    arg_parser.add_argument("--normalize-limit", type=int, default=500, help="每个interpret-as分支最多测量的调用数")
+    arg_parser.add_argument("--skip-startup", action="store_true", help="不测量冷启动")
+    arg_parser.add_argument("--output", help="JSON输出文件, 默认输出到标准输出")
+    args = arg_parser.parse_args()
+
+    from ssml_parser.base.parser import SsmlParser
+    from ssml_parser.base.element import normalize_elements
+    from ssml_parser.normalizer.zh import ZhNormalizer
+
+    corpus = generate_corpus(args.documents, args.paragraphs, args.depth, args.mix, args.seed)
+    corpus_bytes = sum(len(text.encode("utf-8")) for text in corpus)
+    results = {}
+    if not args.skip_startup:
+        results["startup"] = bench_startup(args.repeat)
+
+    parser = SsmlParser()
+    parser.init()
+    normalizers = {"zh-CN": ZhNormalizer()}
+    ZhNormalizer().warmup()
+
+    seconds = timed(lambda: [parser.parse(text) for text in corpus], args.repeat)
+    results["parse"] = {
+        "documents": len(corpus),
+        "total_s": seconds,
+        "us_per_document": 1e6 * seconds / len(corpus),
+        "mb_per_s": corpus_bytes / seconds / 1e6,
+    }
+
+    roots = [parser.parse(text) for text in corpus]
+    results["normalize"] = bench_normalize(collect_leaves(roots), args.repeat, args.normalize_limit)
+
+    # merge_children会修改树, 每次重复使用新解析的树
+    merge_times = []
+    for _ in range(args.repeat):
+        roots = [parser.parse(text) for text in corpus]
+        gc.collect()
+        start = time.perf_counter()
+        for root in roots:
+            root.merge_children()
+        merge_times.append(time.perf_counter() - start)
+    results["merge"] = {"total_s": min(merge_times), "us_per_document": 1e6 * min(merge_times) / len(corpus)}
+
+    def end_to_end():
+        roots = [parser.parse(text) for text in corpus]
+        normalize_elements(roots, normalizers)
+        for root in roots:
+            root.merge_children()
+
+    seconds = timed(end_to_end, 1)
+    results["end_to_end"] = {"total_s": seconds, "documents_per_s": len(corpus) / seconds}
+
+    tracemalloc.start()
+    end_to_end()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results["memory"] = {
+        "python_peak_mb": peak / 1e6,
+        # Linux上ru_maxrss单位为KB, macOS上为字节
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1e6 if sys.platform == "darwin" else 1e3),
+    }
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "config": vars(args),
+            "corpus_bytes": corpus_bytes,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
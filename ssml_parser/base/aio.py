@@ -0,0 +1,185 @@
+# coding=utf-8
+"""
+asyncio接口: 在线程池或进程池中解析并正则化SSML, 不阻塞事件循环
+
+root = await normalize_ssml(ssml_text, {"zh-CN": ZhNormalizer()}, timeout=1.0)
+
+async with AsyncSsmlNormalizer({"zh-CN": ZhNormalizer()}, executor="process", workers=4) as normalizer:
+    root = await normalizer.normalize_ssml(ssml_text)
+"""
+import asyncio
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+import weakref
+
+from .codec import encode_tree, decode_tree
+from .element import SsmlElement, normalize_elements, process_elements
+from .normalizer import Normalizer
+from .parser import SsmlParser
+from .pool import _warmup
+
+
+# 每个进程共用一个解析器(解析器可以在多个线程中共用), 进程池的工作进程各自创建
+_parser = None
+_parser_lock = threading.Lock()
+# 进程池工作进程的normalizers, 在进程启动时初始化
+_worker_normalizers = None
+
+
+def _get_parser() -> SsmlParser:
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                parser = SsmlParser()
+                parser.init()
+                _parser = parser
+    return _parser
+
+
+def _init_worker(normalizers: dict[str, Normalizer], warmup: bool):
+    global _worker_normalizers
+    if warmup:
+        _warmup(normalizers)
+    _worker_normalizers = normalizers
+
+
+def _process_document(text: str, normalizers: dict[str, Normalizer] | None, merge: bool,
+                      encode: bool) -> SsmlElement | list:
+    """
+    encode: 在进程池中执行时为True, 返回 encode_tree 的扁平列表, 深层文档的pickle不受递归深度限制
+    """
+    root = _get_parser().parse(text)
+    normalizers = normalizers if normalizers is not None else _worker_normalizers
+    if merge:
+        process_elements([root], normalizers)
+    else:
+        normalize_elements([root], normalizers)
+    return encode_tree(root) if encode else root
+
+
+class AsyncSsmlNormalizer:
+    """
+    在executor中执行解析+正则化(+merge_children), 同时执行的文档数不超过max_in_flight
+    取消或超时的调用: 尚未开始的文档直接放弃; 已在执行的文档无法中断, 执行完之前仍占用一个名额
+    """
+    def __init__(
+            self,
+            normalizers: dict[str, Normalizer] = None,
+            executor: str | concurrent.futures.Executor = "thread",
+            workers: int = None,
+            max_in_flight: int = None,
+            merge: bool = True,
+    ):
+        """
+        normalizers: 默认使用的 {语言: Normalizer}, 也可以在每次调用时传入
+        executor: "thread", "process" 或已有的 concurrent.futures.Executor(由调用方负责关闭)
+                  纯Python的解析/正则化在线程中受GIL限制, "process" 可以利用多核,
+                  工作进程在启动时获得normalizers的副本, 支持fork时在父进程中预热后共享
+        workers: executor为"thread"/"process"时的线程/进程数, 默认为CPU核数
+        max_in_flight: 每个事件循环中同时提交到executor的最大文档数, 默认为 workers
+        merge: 正则化后是否调用 merge_children
+        """
+        workers = workers or os.cpu_count() or 1
+        max_in_flight = max_in_flight or workers
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be positive: {max_in_flight}")
+        self.normalizers = normalizers
+        self.merge = merge
+        self.max_in_flight = max_in_flight
+        self._owns_executor = isinstance(executor, str)
+        # 结果需要在进程之间传递时以 encode_tree 的形式返回
+        self._encode = executor == "process"
+        # 进程池的工作进程已有normalizers, 调用时不再传递
+        self._worker_has_normalizers = False
+        if executor == "thread":
+            self._executor = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix="ssml-normalize")
+        elif executor == "process":
+            if "fork" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("fork")
+                if normalizers:
+                    _warmup(normalizers)
+                worker_warmup = False
+            else:
+                context = multiprocessing.get_context()
+                worker_warmup = True
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                workers, mp_context=context, initializer=_init_worker, initargs=(normalizers, worker_warmup))
+            self._worker_has_normalizers = normalizers is not None
+        elif isinstance(executor, concurrent.futures.Executor):
+            self._executor = executor
+            self._encode = isinstance(executor, concurrent.futures.ProcessPoolExecutor)
+        else:
+            raise ValueError(f"Unsupported executor: {executor}")
+        # asyncio.Semaphore只能在一个事件循环中使用, 每个事件循环各有一个
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    async def normalize_ssml(self, text: str, normalizers: dict[str, Normalizer] = None,
+                             timeout: float = None) -> SsmlElement:
+        """
+        解析并正则化一个SSML文档
+        normalizers: 默认为构造时传入的normalizers
+        timeout: 从调用开始计算的超时时间(秒), 包括排队时间, 超时抛出TimeoutError
+        """
+        if normalizers is None and not self._worker_has_normalizers:
+            normalizers = self.normalizers
+            if normalizers is None:
+                raise ValueError("normalizers is required")
+        if timeout is None:
+            return await self._run(text, normalizers)
+        return await asyncio.wait_for(self._run(text, normalizers), timeout)
+
+    async def _run(self, text: str, normalizers: dict[str, Normalizer] | None) -> SsmlElement:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+        await semaphore.acquire()
+        try:
+            future = self._executor.submit(_process_document, text, normalizers, self.merge, self._encode)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        # 文档真正执行完(或在开始前被取消)时才释放名额, 被放弃的调用不会让executor中的文档数超过上限
+        def release(_):
+            try:
+                loop.call_soon_threadsafe(semaphore.release)
+            except RuntimeError:
+                # 事件循环已关闭
+                pass
+
+        future.add_done_callback(release)
+        # 取消wrap_future返回的future时会取消尚未开始的任务
+        result = await asyncio.wrap_future(future)
+        return decode_tree(result) if self._encode else result
+
+    def close(self, wait: bool = True):
+        """
+        关闭自己创建的executor, 尚未开始的文档被取消
+        """
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+# normalize_ssml使用的默认线程池
+_default_normalizer = None
+
+
+async def normalize_ssml(text: str, normalizers: dict[str, Normalizer], timeout: float = None) -> SsmlElement:
+    """
+    在默认的线程池中解析并正则化一个SSML文档, 并调用 merge_children
+    需要进程池, 不同的并发上限或不合并时使用 AsyncSsmlNormalizer
+    """
+    global _default_normalizer
+    if _default_normalizer is None:
+        _default_normalizer = AsyncSsmlNormalizer()
+    return await _default_normalizer.normalize_ssml(text, normalizers, timeout)
@@ -0,0 +1,144 @@
+# coding=utf-8
+"""
+expat后端: 根据expat的start/end/文本事件一次遍历直接创建SSML元素, 不构建ElementTree
+命名空间前缀由expat在事件中给出(namespace_prefixes), 不需要预先扫描speak标签或查找命名空间栈
+"""
+from xml.etree import ElementTree as ET
+from xml.parsers import expat
+
+from .element import SsmlElement, SsmlNodeElement, SsmlLeafElement, PlainText, EMPTY_ATTRS, intern_attrs
+
+# 每个解析器最多缓存的限定名个数
+_MAX_CACHED_NAMES = 1024
+
+
+def _qualified_name(name: str, cache: dict) -> str:
+    """
+    expat的名字 "uri}local}prefix" / "uri}local"(默认命名空间) / "local" 转换为 "prefix:local" 或 "local"
+    """
+    result = cache.get(name)
+    if result is None:
+        parts = name.split("}")
+        if len(parts) == 3:
+            result = f"{parts[2]}:{parts[1]}"
+        else:
+            result = parts[-1]
+        if len(cache) < _MAX_CACHED_NAMES:
+            cache[name] = result
+    return result
+
+
+def _parse_error(e: expat.ExpatError) -> ET.ParseError:
+    """
+    转换为与ElementTree后端相同的异常类型
+    """
+    error = ET.ParseError(str(e))
+    error.code = e.code
+    error.position = (e.lineno, e.offset)
+    return error
+
+
+def build_tree(ssml_parser, data: str | bytes) -> SsmlElement:
+    """
+    解析SSML文本或字节串(按XML声明的编码解码, 默认UTF-8), 结果与ElementTree后端相同
+    """
+    tags = ssml_parser.tags
+    names = ssml_parser._qualified_names
+    # expat名字 -> (元素类, 是否为叶子); expat的属性列表 -> 共享的属性字典
+    element_classes = {}
+    attrs_table = {}
+    # 打开的节点元素
+    stack = []
+    # 当前节点或叶子中尚未处理的文本片段
+    text = []
+    # 文档中的命名空间声明 {前缀: URI}, 同一前缀只记录第一次声明
+    namespaces = {}
+    # root, 当前叶子, 叶子内部嵌套的元素深度, 叶子中是否已出现子元素
+    state = [None, None, 0, False]
+
+    def flush_text(node):
+        if text:
+            node.children.append(PlainText(parent=node, attrs=EMPTY_ATTRS, text="".join(text)))
+            text.clear()
+
+    def start(name, attributes):
+        leaf = state[1]
+        if leaf is not None:
+            # 叶子内部的元素被忽略, 叶子的文本只取第一个子元素之前的部分
+            state[2] += 1
+            state[3] = True
+            return
+        info = element_classes.get(name)
+        if info is None:
+            tag = _qualified_name(name, names)
+            element_class = tags.get(tag)
+            if element_class is None:
+                raise ValueError(f"Unsupported SSML tag: {tag}")
+            info = element_classes[name] = (element_class, issubclass(element_class, SsmlLeafElement))
+        element_class, is_leaf = info
+        if attributes:
+            key = tuple(attributes)
+            attrs = attrs_table.get(key)
+            if attrs is None:
+                attrs = {}
+                for i in range(0, len(attributes), 2):
+                    attrs[_qualified_name(attributes[i], names)] = attributes[i + 1]
+                attrs = attrs_table[key] = intern_attrs(attrs)
+        else:
+            attrs = EMPTY_ATTRS
+
+        parent = None
+        if stack:
+            parent = stack[-1]
+            flush_text(parent)
+        if is_leaf:
+            element = element_class(parent=parent, attrs=attrs, text="")
+            state[1] = element
+            state[2] = 0
+            state[3] = False
+        else:
+            element = element_class(parent=parent, attrs=attrs)
+            if parent is not None:
+                ssml_parser._check_depth(len(stack) + 1)
+            stack.append(element)
+        if parent is not None:
+            parent.children.append(element)
+        else:
+            state[0] = element
+
+    def end(name):
+        leaf = state[1]
+        if leaf is not None:
+            if state[2]:
+                state[2] -= 1
+                return
+            leaf.text = "".join(text)
+            text.clear()
+            state[1] = None
+            state[3] = False
+            return
+        flush_text(stack.pop())
+
+    def character_data(data):
+        if not state[3]:
+            text.append(data)
+
+    def start_namespace(prefix, uri):
+        namespaces.setdefault(prefix or "", uri)
+
+    parser = expat.ParserCreate(namespace_separator="}")
+    parser.namespace_prefixes = True
+    parser.ordered_attributes = True
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = character_data
+    parser.StartNamespaceDeclHandler = start_namespace
+    try:
+        parser.Parse(data, True)
+    except expat.ExpatError as e:
+        raise _parse_error(e) from None
+    root = state[0]
+    if namespaces and isinstance(root, SsmlNodeElement):
+        root.namespaces = namespaces
+    return root
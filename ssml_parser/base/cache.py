@@ -0,0 +1,265 @@
+# coding=utf-8
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+# 缓存未命中
+MISSING = object()
+# 负缓存: 该输入按interpret-as正则化失败, 回退到了普通文本正则化, 需要按值(==)比较
+FALLBACK = "\0fallback"
+
+# 每个缓存项在key和value字符串之外的大致开销(OrderedDict节点, tuple等)
+_ENTRY_OVERHEAD = 200
+
+
+def _entry_size(key: tuple, value: str) -> int:
+    size = _ENTRY_OVERHEAD + sys.getsizeof(value)
+    for item in key:
+        if item is not None:
+            size += sys.getsizeof(item)
+    return size
+
+
+class LruResultCache:
+    """
+    进程内的正则化结果缓存, key为 (language, interpret-as, format, text)
+    按估算的字节数限制大小, 超出时淘汰最久未使用的项, 线程安全
+    """
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        # 传给其他进程时只保留配置, 不复制缓存内容
+        return LruResultCache, (self.max_bytes,)
+
+    def get(self, key: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, value: str):
+        size = _entry_size(key, value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class SqliteResultCache:
+    """
+    基于SQLite的持久化结果缓存, 可以被同一台机器上的多个进程同时读写
+    version: 只读取相同version的结果(ZhNormalizer的key已经包含结果的版本, 不需要再指定)
+    purge_stale: 打开时删除其他version的结果; 其他版本的进程可能仍在使用同一文件, 默认不删除
+    max_bytes: 超过后按最近使用时间淘汰
+    缓存出错(如数据库被长时间锁住)时当作未命中处理, 不影响正则化
+    """
+    # 命中时最多每隔这么多秒更新一次最近使用时间, 避免每次读取都写库
+    touch_interval = 60.0
+    # 每写入这么多次检查一次总大小
+    check_interval = 100
+
+    def __init__(self, path: str, version: str = "", max_bytes: int = 256 * 1024 * 1024,
+                 timeout: float = 30.0, purge_stale: bool = False):
+        self.path = path
+        self.version = version
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+        self._puts = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "version TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "size INTEGER NOT NULL, last_used REAL NOT NULL, PRIMARY KEY (version, key))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        if purge_stale:
+            conn.execute("DELETE FROM results WHERE version != ?", (version,))
+
+    def __reduce__(self):
+        return SqliteResultCache, (self.path, self.version, self.max_bytes, self.timeout, False)
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite连接不能跨线程/跨进程共用, 每个线程(fork后的进程)各自打开
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _encode_key(key: tuple) -> str:
+        return json.dumps(key, ensure_ascii=False)
+
+    def _count(self, name: str, value: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def get(self, key: tuple):
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, last_used FROM results WHERE version = ? AND key = ?",
+                (self.version, self._encode_key(key)),
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return MISSING
+            now = time.time()
+            if now - row[1] > self.touch_interval:
+                conn.execute(
+                    "UPDATE results SET last_used = ? WHERE version = ? AND key = ?",
+                    (now, self.version, self._encode_key(key)),
+                )
+        except sqlite3.Error:
+            self._count("errors")
+            self._count("misses")
+            return MISSING
+        self._count("hits")
+        return row[0]
+
+    def put(self, key: tuple, value: str):
+        size = _entry_size(key, value)
+        if size > self.max_bytes:
+            return
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO results (version, key, value, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (self.version, self._encode_key(key), value, size, time.time()),
+            )
+            with self._lock:
+                self._puts += 1
+                check = self._puts % self.check_interval == 0
+            if check:
+                self.evict()
+        except sqlite3.Error:
+            self._count("errors")
+
+    def evict(self):
+        """
+        总大小超过max_bytes时, 淘汰最久未使用的结果直到低于max_bytes的90%
+        """
+        conn = self._connection()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = total - int(self.max_bytes * 0.9)
+        # 按最近使用时间累计大小, 删除累计到target为止的结果
+        cursor = conn.execute(
+            "DELETE FROM results WHERE rowid IN ("
+            "SELECT rowid FROM (SELECT rowid, SUM(size) OVER (ORDER BY last_used, rowid "
+            "ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) - size AS freed FROM results) "
+            "WHERE freed < ?)",
+            (target,),
+        )
+        self._count("evictions", cursor.rowcount)
+
+    def warm(self, cache, limit: int = None):
+        """
+        把最近使用的结果加载到另一个缓存(如 LruResultCache)中, 用于新进程启动时预热
+        """
+        sql = "SELECT key, value FROM results WHERE version = ? ORDER BY last_used"
+        rows = self._connection().execute(sql, (self.version,)).fetchall()
+        if limit is not None:
+            rows = rows[-limit:] if limit else []
+        for key, value in rows:
+            cache.put(tuple(json.loads(key)), value)
+        return len(rows)
+
+    def clear(self):
+        self._connection().execute("DELETE FROM results")
+
+    def stats(self) -> dict:
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results WHERE version = ?", (self.version,)
+        ).fetchone()
+        with self._lock:
+            return {
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "errors": self.errors,
+            }
+
+
+class TieredResultCache:
+    """
+    两级缓存: 先查进程内缓存, 未命中再查持久化缓存, 命中后写回进程内缓存
+    """
+    def __init__(self, memory, persistent):
+        self.memory = memory
+        self.persistent = persistent
+
+    def get(self, key: tuple):
+        value = self.memory.get(key)
+        if value is MISSING:
+            value = self.persistent.get(key)
+            if value is not MISSING:
+                self.memory.put(key, value)
+        return value
+
+    def put(self, key: tuple, value: str):
+        self.memory.put(key, value)
+        self.persistent.put(key, value)
+
+    def clear(self):
+        self.memory.clear()
+        self.persistent.clear()
+
+    def stats(self) -> dict:
+        return {"memory": self.memory.stats(), "persistent": self.persistent.stats()}
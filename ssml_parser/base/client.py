@@ -0,0 +1,102 @@
+# coding=utf-8
+"""
+正则化服务(ssml_parser.base.server)的客户端
+
+with NormalizerClient("/tmp/ssml-normalizer.sock") as client:
+    root = client.normalize_ssml(ssml_text)
+    texts = client.normalize_leaves([("123", {"interpret-as": "cardinal"})], lang="zh-CN")
+
+RemoteNormalizer 把服务包装成 Normalizer, 可以直接用于 normalize_elements 等接口
+"""
+import itertools
+import json
+import socket
+import threading
+
+from .codec import decode_tree
+from .element import SsmlElement
+from .normalizer import Normalizer
+
+
+class NormalizerClient:
+    """
+    与服务之间的一个连接, 同一连接上的请求串行执行
+    多个线程并发请求时每个线程使用各自的客户端, 服务端才能把它们合并成一批
+    address: Unix socket路径, 或 (host, port)
+    """
+    def __init__(self, address: str | tuple, timeout: float = None):
+        if isinstance(address, str):
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock.settimeout(timeout)
+        self._sock.connect(address)
+        self._reader = self._sock.makefile("rb")
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def _call(self, request: dict):
+        with self._lock:
+            request["id"] = next(self._ids)
+            self._sock.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+            line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by the normalization server")
+        response = json.loads(line)
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response["result"]
+
+    def normalize_ssml(self, text: str, merge: bool = True) -> SsmlElement:
+        """
+        解析并正则化SSML文档, merge为True时服务端还会调用 merge_children
+        """
+        return decode_tree(self._call({"type": "ssml", "text": text, "merge": merge}))
+
+    def normalize_leaves(self, items: list, lang: str = "zh-CN") -> list:
+        """
+        items: [(text, attrs), ...], 与 Normalizer.normalize_batch 相同
+        """
+        return self._call({"type": "leaves", "lang": lang, "items": [[text, attrs or {}] for text, attrs in items]})
+
+    def stats(self) -> dict:
+        """
+        服务端的队列深度和批大小统计, 参考 MicroBatcher.stats
+        """
+        return self._call({"type": "stats"})
+
+    def close(self):
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class RemoteNormalizer(Normalizer):
+    """
+    通过服务正则化叶子节点的Normalizer, 每个线程使用自己的连接
+    """
+    def __init__(self, address: str | tuple, language: str = "zh-CN", timeout: float = None):
+        self.address = address
+        self.language = language
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _client(self) -> NormalizerClient:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = NormalizerClient(self.address, self.timeout)
+        return client
+
+    def normalize(self, text: str, attrs: dict = None):
+        return self.normalize_batch([(text, attrs)])[0]
+
+    def normalize_batch(self, items: list) -> list:
+        if not items:
+            return []
+        return self._client().normalize_leaves(items, self.language)
@@ -0,0 +1,60 @@
+# coding=utf-8
+"""
+元素树与扁平列表之间的转换, 用于在进程之间(进程池, 正则化服务)传递元素树
+元素树的pickle和JSON编码都是递归的, 扁平的列表在深层文档上也不受递归深度限制
+"""
+from .element import SsmlElement, SsmlNodeElement, SsmlLeafElement
+from .parser import SsmlParser
+
+
+def _element_classes() -> dict:
+    parser = SsmlParser()
+    parser.init()
+    return parser.tags
+
+
+# 内置的 标签名 -> 元素类
+_ELEMENT_CLASSES = _element_classes()
+
+
+def encode_tree(root: SsmlElement) -> list:
+    """
+    把元素树编码为前序排列的 [深度, 标签名, 属性, 文本] 列表, 节点元素的文本位置为其命名空间声明(通常为None)
+    """
+    result = []
+    stack = [(root, 0)]
+    while stack:
+        element, depth = stack.pop()
+        if isinstance(element, SsmlNodeElement):
+            result.append([depth, element.tag_name(), element.attrs, element.namespaces])
+            stack.extend((child, depth + 1) for child in reversed(element.children))
+        else:
+            result.append([depth, element.tag_name(), element.attrs, element.text])
+    return result
+
+
+def decode_tree(items: list, tags: dict = None) -> SsmlElement:
+    """
+    encode_tree 的逆操作
+    tags: 标签名 -> 元素类, 默认为内置的标签; 树中有自定义标签时传入解析时使用的 SsmlParser.tags
+    """
+    tags = tags if tags is not None else _ELEMENT_CLASSES
+    root = None
+    path = []
+    for depth, tag, attrs, text in items:
+        del path[depth:]
+        parent = path[-1] if path else None
+        element_class = tags.get(tag)
+        if element_class is None:
+            raise ValueError(f"Unsupported SSML tag: {tag} (custom tags need the tag table passed as tags)")
+        if issubclass(element_class, SsmlLeafElement):
+            element = element_class(parent=parent, attrs=attrs, text=text)
+        else:
+            element = element_class(parent=parent, attrs=attrs)
+            element.namespaces = text
+            path.append(element)
+        if parent is None:
+            root = element
+        else:
+            parent.children.append(element)
+    return root
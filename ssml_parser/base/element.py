@@ -1,30 +1,179 @@
 # coding=utf-8
 import abc
+import weakref
 
 # from pydantic import BaseModel, Field
 from typing import ClassVar
 from .normalizer import Normalizer
+from .instrument import instrumented
+
+
+class FrozenAttrs(dict):
+    """
+    只读的属性字典, 可以在多个元素之间共享
+    """
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("SSML element attrs are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self):
+        return FrozenAttrs, (dict(self),)
+
+
+EMPTY_ATTRS = FrozenAttrs()
+
+
+def intern_attrs(attrs: dict, table: dict = None) -> FrozenAttrs:
+    """
+    把属性字典转换为FrozenAttrs, 传入table时相同内容的属性字典共用同一个对象
+    """
+    if not attrs:
+        return EMPTY_ATTRS
+    if table is None:
+        return attrs if isinstance(attrs, FrozenAttrs) else FrozenAttrs(attrs)
+    key = tuple(attrs.items())
+    frozen = table.get(key)
+    if frozen is None:
+        frozen = attrs if isinstance(attrs, FrozenAttrs) else FrozenAttrs(attrs)
+        table[key] = frozen
+    return frozen
+
+
+class InheritedAttrs:
+    """
+    从祖先节点继承的生效属性: xml:lang, 合并后的voice和prosody属性
+    """
+    __slots__ = ("lang", "voice", "prosody")
+
+    def __init__(self, lang: str = None, voice: FrozenAttrs = EMPTY_ATTRS, prosody: FrozenAttrs = EMPTY_ATTRS):
+        self.lang = lang
+        self.voice = voice
+        self.prosody = prosody
+
+
+ROOT_INHERITED = InheritedAttrs()
+
 
 class SsmlElement:
+    """
+    元素只通过弱引用指向父节点, 树中不存在引用环
+    注意: 只持有子节点而不持有根节点时, 父节点会被回收, parent变为None;
+    继承的属性(xml:lang/voice/prosody)在创建元素时已经计算, 不受影响
+    修改parent或attrs时清除整棵子树缓存的继承属性
+    """
     __tagname__: ClassVar[str] = ""
+    # 可以合并到本元素之后的元素的标签, can_merge/merge_children/process都只查这张表
+    merges_with: ClassVar[frozenset] = frozenset()
+    __slots__ = ("_parent", "_inherited", "_attrs", "__weakref__")
 
     def __init__(self, parent: "SsmlElement", attrs: dict):
         # super().__init__(parent=parent, attrs=attrs)
-        self.parent = parent
-        self.attrs = attrs or {}
+        self._parent = weakref.ref(parent) if parent is not None else None
+        self._attrs = intern_attrs(attrs)
+        self._inherited = self._inherit(parent.inherited() if parent is not None else ROOT_INHERITED)
+
+    @property
+    def parent(self) -> "SsmlElement":
+        return self._parent() if self._parent is not None else None
+
+    @parent.setter
+    def parent(self, parent: "SsmlElement"):
+        self._parent = weakref.ref(parent) if parent is not None else None
+        self._clear_inherited()
+
+    @property
+    def attrs(self) -> FrozenAttrs:
+        return self._attrs
+
+    @attrs.setter
+    def attrs(self, attrs: dict):
+        self._attrs = intern_attrs(attrs)
+        self._clear_inherited()
+
+    def _clear_inherited(self):
+        self._inherited = None
+
+    def __getstate__(self):
+        # 弱引用不能pickle, parent由父节点的__setstate__恢复
+        return {name: getattr(self, name) for name in self._state_slots()}
+
+    def __setstate__(self, state):
+        self._parent = None
+        self._inherited = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def _state_slots(cls):
+        names = []
+        for klass in cls.__mro__:
+            for name in klass.__dict__.get("__slots__", ()):
+                if name not in ("_parent", "_inherited", "__weakref__"):
+                    names.append(name)
+        return names
 
     def tag_name(self) -> str:
         return self.__tagname__
 
     def can_merge(self, element: "SsmlElement") -> bool:
-        return False
+        return element.__tagname__ in self.merges_with
 
     def merge(self, element: "SsmlElement") -> "SsmlElement":
         return self
 
+    def merge_run(self, elements: list["SsmlElement"]) -> "SsmlElement":
+        """
+        合并一段可合并的元素, elements[0] 是self, 后面的元素都满足 self.can_merge
+        默认逐个调用merge, 子类可以一次性合并以避免中间对象
+        """
+        current = self
+        for element in elements[1:]:
+            current = current.merge(element)
+        return current
+
     def normalize(self, normalizers: dict[str, Normalizer]):
         pass
 
+    def inherited(self) -> InheritedAttrs:
+        """
+        生效的继承属性, 创建元素时计算并缓存在节点上
+        修改parent后缓存失效, 向上找到最近的已缓存祖先, 再自上而下计算并缓存路径上的节点
+        """
+        inherited = self._inherited
+        if inherited is not None:
+            return inherited
+        path = []
+        node = self
+        while node is not None and node._inherited is None:
+            path.append(node)
+            node = node.parent
+        inherited = node._inherited if node is not None else ROOT_INHERITED
+        for node in reversed(path):
+            inherited = node._inherit(inherited)
+            node._inherited = inherited
+        return inherited
+
+    def _inherit(self, inherited: InheritedAttrs) -> InheritedAttrs:
+        if not self.attrs:
+            return inherited
+        tag = self.tag_name()
+        lang = self.attrs.get("xml:lang", inherited.lang)
+        voice, prosody = inherited.voice, inherited.prosody
+        if tag == "voice":
+            voice = FrozenAttrs({**voice, **self.attrs})
+        elif tag == "prosody":
+            prosody = FrozenAttrs({**prosody, **self.attrs})
+        elif lang == inherited.lang:
+            return inherited
+        return InheritedAttrs(lang, voice, prosody)
+
     def _get_attr_in_path(self, name):
         node = self
         while node is not None:
@@ -33,64 +182,171 @@ class SsmlElement:
             node = node.parent
         return None
 
+    def to_ssml(self, pretty: bool = False, indent: str = "  ", namespaces: dict[str, str] = None) -> str:
+        """
+        序列化为SSML文本, 参考 write_ssml
+        """
+        parts = []
+        _serialize(self, parts, None, pretty, indent, namespaces)
+        return "".join(parts)
+
+    def write_ssml(self, stream, pretty: bool = False, indent: str = "  ", namespaces: dict[str, str] = None,
+                   buffer_size: int = 1024):
+        """
+        一次遍历把SSML写入文本流(文件, io.StringIO, socket.makefile("w", encoding="utf-8")等)
+        pretty: 只在不直接包含带文本叶子的节点内换行缩进, 已有的文本不变, 但重新解析时节点之间会多出空白文本
+        namespaces: 在最外层元素上声明的命名空间 {前缀: URI}, 前缀为""时为默认命名空间,
+                    属性名中除xml以外的前缀都需要声明; 默认使用解析时记录在根元素上的声明
+        buffer_size: 累积多少个字符串片段后写入一次
+        """
+        parts = []
+
+        def flush():
+            stream.write("".join(parts))
+            parts.clear()
+
+        _serialize(self, parts, (flush, buffer_size), pretty, indent, namespaces)
+        flush()
+
 
 class SsmlNodeElement(SsmlElement, abc.ABC):
+    __slots__ = ("children", "namespaces")
+
     def __init__(self, parent: "SsmlElement", attrs:dict):
         super().__init__(parent=parent, attrs=attrs)
         self.children = []
+        # 解析时在文档中记录的命名空间声明 {前缀: URI}, 只设置在根元素上, 序列化时默认输出
+        self.namespaces = None
 
-    def normalize(self, normalizers: dict[str, Normalizer]):
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        # 子节点的继承属性在__setstate__中已经清除, 不需要再经过parent的setter清除子树
         for child in self.children:
-            child.normalize(normalizers)
-    
-    def merge_children(self):
-        for child in self.children:
-            if isinstance(child, SsmlNodeElement):
-                child.merge_children()
+            child._parent = weakref.ref(self)
 
+    def _clear_inherited(self):
+        # 显式栈遍历, 子树中已缓存的继承属性都来自原来的祖先
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node._inherited = None
+            if isinstance(node, SsmlNodeElement):
+                stack.extend(node.children)
+
+    def normalize(self, normalizers: dict[str, Normalizer]):
+        normalize_elements([self], normalizers)
+
+    def process(self, normalizers: dict[str, Normalizer]):
+        """
+        正则化并合并, 结果与先 normalize 再 merge_children 相同, 参考 process_elements
+        """
+        process_elements([self], normalizers)
+
+    def iter_leaves(self):
+        # 显式栈遍历, 避免嵌套生成器在深层文档上每个叶子都要经过O(depth)层yield
+        stack = [iter(self.children)]
+        while stack:
+            for child in stack[-1]:
+                if isinstance(child, SsmlNodeElement):
+                    stack.append(iter(child.children))
+                    break
+                yield child
+            else:
+                stack.pop()
+
+    def iter_segments(self, max_chars: int = 0, normalizers: dict[str, Normalizer] = None):
+        """
+        惰性地生成扁平的合成片段(SsmlSegment), 片段带有生效的 xml:lang/voice/prosody 属性
+        max_chars: 大于0时按标点把过长的文本切分成不超过max_chars的片段
+        normalizers: 不为空时在生成片段前才正则化对应的叶子节点
+        """
+        for leaf in self.iter_leaves():
+            if normalizers is not None:
+                leaf.normalize(normalizers)
+            inherited = leaf.inherited()
+            if leaf.tag_name() == "break":
+                yield SsmlSegment("", inherited.lang, inherited.voice, inherited.prosody,
+                                  break_time=leaf.attrs.get("time"))
+                continue
+            for text in split_text(leaf.text, max_chars):
+                yield SsmlSegment(text, inherited.lang, inherited.voice, inherited.prosody)
+
+    @instrumented("merge")
+    def merge_children(self):
+        # 显式栈遍历, 按前序的逆序处理, 保证子节点先于父节点合并
+        nodes = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(child for child in node.children if isinstance(child, SsmlNodeElement))
+        for node in reversed(nodes):
+            node._merge_own_children()
+
+    def _merge_own_children(self):
+        # 先收集连续的可合并元素, 每段只合并一次
         if len(self.children) == 0:
             return
         new_children = []
-        current_child = self.children[0]
+        run = [self.children[0]]
+        merges_with = run[0].merges_with
         for child in self.children[1:]:
-            if current_child.can_merge(child):
-                current_child = current_child.merge(child)
+            if child.__tagname__ in merges_with:
+                run.append(child)
             else:
-                new_children.append(current_child)
-                current_child = child
-        new_children.append(current_child)
+                new_children.append(run[0].merge_run(run) if len(run) > 1 else run[0])
+                run = [child]
+                merges_with = child.merges_with
+        new_children.append(run[0].merge_run(run) if len(run) > 1 else run[0])
         self.children = new_children
 
 
 class SsmlLeafElement(SsmlElement, abc.ABC):
+    __slots__ = ("text",)
+    # 是否直接由语言对应的Normalizer批量正则化; 重写了normalize的子类为False, 逐个调用其normalize
+    uses_normalizer: ClassVar[bool] = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.uses_normalizer = cls.normalize is SsmlLeafElement.normalize
+
     def __init__(self, parent: "SsmlElement", attrs: dict, text: str):
         super().__init__(parent=parent, attrs=attrs)
         self.text = text or ""
 
     def normalize(self, normalizers: dict[str, Normalizer]):
-        lang = self._get_attr_in_path("xml:lang")
+        lang = self.inherited().lang
         if lang in normalizers:
             self.text = normalizers[lang].normalize(text=self.text, attrs=self.attrs)
 
 
+# 文本, say-as和sub正则化后都是普通文本, 相邻时合并为一个PlainText
+MERGEABLE_TAGS = frozenset(["_plain", "say-as", "sub"])
+
+
 class Speak(SsmlNodeElement):
     __tagname__: ClassVar[str] = "speak"
+    __slots__ = ()
 
 
 class Prosody(SsmlNodeElement):
     __tagname__: ClassVar[str] = "prosody"
+    __slots__ = ()
 
 
 class Voice(SsmlNodeElement):
     __tagname__: ClassVar[str] = "voice"
+    __slots__ = ()
 
 
 class Lang(SsmlNodeElement):
     __tagname__: ClassVar[str] = "lang"
+    __slots__ = ()
 
 
 class Break(SsmlLeafElement):
     __tagname__: ClassVar[str] = "break"
+    __slots__ = ()
 
     def normalize(self, normalizers: dict[str, Normalizer]):
         self.text = ""
@@ -98,9 +354,8 @@ class Break(SsmlLeafElement):
 
 class PlainText(SsmlLeafElement):
     __tagname__: ClassVar[str] = "_plain"
-    
-    def can_merge(self, element: "SsmlElement") -> bool:
-        return element.tag_name() in ["_plain", "say-as", "sub"]
+    __slots__ = ()
+    merges_with: ClassVar[frozenset] = MERGEABLE_TAGS
 
     def merge(self, element: "SsmlElement") -> "SsmlElement":
         if not isinstance(element, SsmlLeafElement):
@@ -108,24 +363,29 @@ class PlainText(SsmlLeafElement):
         self.text += element.text
         return self
 
+    def merge_run(self, elements: list["SsmlElement"]) -> "SsmlElement":
+        self.text = "".join(element.text for element in elements)
+        return self
+
 
 class SayAs(SsmlLeafElement):
     __tagname__: ClassVar[str] = "say-as"
-    
-    def can_merge(self, element: "SsmlElement") -> bool:
-        return element.tag_name() in ["_plain", "say-as", "sub"]
+    __slots__ = ()
+    merges_with: ClassVar[frozenset] = MERGEABLE_TAGS
 
     def merge(self, element: "SsmlElement") -> "SsmlElement":
         if not isinstance(element, SsmlLeafElement):
             raise ValueError(f"Can not merge tag [{self.tag_name()}] with [{element.tag_name()}]")
         return PlainText(parent=self.parent, attrs={}, text=self.text + element.text)
 
+    def merge_run(self, elements: list["SsmlElement"]) -> "SsmlElement":
+        return PlainText(parent=self.parent, attrs={}, text="".join(element.text for element in elements))
+
 
 class Sub(SsmlLeafElement):
     __tagname__: ClassVar[str] = "sub"
-    
-    def can_merge(self, element: "SsmlElement") -> bool:
-        return element.tag_name() in ["_plain", "say-as", "sub"]
+    __slots__ = ()
+    merges_with: ClassVar[frozenset] = MERGEABLE_TAGS
 
     def merge(self, element: "SsmlElement") -> "SsmlElement":
         if not isinstance(element, SsmlLeafElement):
@@ -133,16 +393,256 @@ class Sub(SsmlLeafElement):
         # self.text += element.text
         return PlainText(parent=self.parent, attrs={}, text=self.text + element.text)
 
+    def merge_run(self, elements: list["SsmlElement"]) -> "SsmlElement":
+        return PlainText(parent=self.parent, attrs={}, text="".join(element.text for element in elements))
+
     def normalize(self, normalizers: dict[str, Normalizer]):
         self.text = self.attrs.get("alias", self.text)
-    
-    
-
-    
-
-
-
-
-    
 
 
+class SsmlSegment:
+    """
+    合成片段: 文本及其生效的 xml:lang/voice/prosody 属性, break片段的文本为空
+    """
+    __slots__ = ("text", "lang", "voice", "prosody", "break_time")
+
+    def __init__(self, text: str, lang: str | None, voice: dict, prosody: dict, break_time: str = None):
+        self.text = text
+        self.lang = lang
+        self.voice = voice
+        self.prosody = prosody
+        self.break_time = break_time
+
+    def __repr__(self):
+        return (f"SsmlSegment(text={self.text!r}, lang={self.lang!r}, voice={self.voice!r}, "
+                f"prosody={self.prosody!r}, break_time={self.break_time!r})")
+
+
+SEGMENT_PUNCTUATION = frozenset("。！？；，、：,.!?;:\n")
+
+
+def split_text(text: str, max_chars: int = 0):
+    """
+    把文本切分成不超过max_chars的片段, 尽量在标点处切分, max_chars<=0时不切分
+    """
+    if not text:
+        return
+    if max_chars <= 0:
+        yield text
+        return
+    start = 0
+    while len(text) - start > max_chars:
+        end = start + max_chars
+        cut = end
+        while cut > start and text[cut - 1] not in SEGMENT_PUNCTUATION:
+            cut -= 1
+        if cut == start:
+            cut = end
+        yield text[start:cut]
+        start = cut
+    if start < len(text):
+        yield text[start:]
+
+
+def _escape_text(text: str) -> str:
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+_ATTR_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;",
+                               "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"})
+_ATTR_SPECIAL = frozenset("&<>\"\n\r\t")
+
+
+def _escape_attr(value: str) -> str:
+    return value.translate(_ATTR_ESCAPES) if not _ATTR_SPECIAL.isdisjoint(value) else value
+
+
+def _serialize(root: SsmlElement, parts: list, flush, pretty: bool, indent: str, namespaces: dict | None):
+    """
+    显式栈遍历, 把SSML片段追加到parts, flush为 (回调, 片段数) 时片段数达到上限后调用回调
+    同一文档中相同的属性字典通常是同一个对象, 其序列化结果按id缓存
+    """
+    write = parts.append
+    if namespaces is None:
+        top = root
+        while top.parent is not None:
+            top = top.parent
+        namespaces = getattr(top, "namespaces", None)
+    declared = {"xml"}
+    declarations = ""
+    if namespaces:
+        declared.update(namespaces)
+        declarations = "".join(
+            f' xmlns:{prefix}="{_escape_attr(uri)}"' if prefix else f' xmlns="{_escape_attr(uri)}"'
+            for prefix, uri in namespaces.items()
+        )
+    attr_strings = {}
+
+    def attributes(attrs: dict) -> str:
+        result = attr_strings.get(id(attrs))
+        if result is None:
+            items = []
+            for name, value in attrs.items():
+                prefix, colon, _ = name.partition(":")
+                if colon and prefix not in declared:
+                    raise ValueError(f"Namespace prefix is not declared: {name}")
+                items.append(f' {name}="{_escape_attr(value)}"')
+            result = attr_strings[id(attrs)] = "".join(items)
+        return result
+
+    def write_leaf(leaf: SsmlLeafElement, extra: str = ""):
+        tag = leaf.__tagname__
+        if tag == "_plain":
+            write(_escape_text(leaf.text))
+        elif leaf.text:
+            write(f"<{tag}{attributes(leaf.attrs)}{extra}>{_escape_text(leaf.text)}</{tag}>")
+        else:
+            write(f"<{tag}{attributes(leaf.attrs)}{extra}/>")
+
+    def is_block(node: SsmlNodeElement) -> bool:
+        # 含有文本的叶子(包括say-as/sub等)之间插入空白会改变朗读的文本
+        return pretty and all(isinstance(child, SsmlNodeElement) or not child.text for child in node.children)
+
+    if not isinstance(root, SsmlNodeElement):
+        write_leaf(root, declarations)
+        return
+    if not root.children:
+        write(f"<{root.__tagname__}{attributes(root.attrs)}{declarations}/>")
+        return
+    write(f"<{root.__tagname__}{attributes(root.attrs)}{declarations}>")
+    stack = [(root, iter(root.children), is_block(root))]
+    while stack:
+        node, children, block = stack[-1]
+        for child in children:
+            if block:
+                write("\n" + indent * len(stack))
+            if isinstance(child, SsmlNodeElement):
+                if child.children:
+                    write(f"<{child.__tagname__}{attributes(child.attrs)}>")
+                    stack.append((child, iter(child.children), is_block(child)))
+                    break
+                write(f"<{child.__tagname__}{attributes(child.attrs)}/>")
+            else:
+                write_leaf(child)
+            if flush is not None and len(parts) >= flush[1]:
+                flush[0]()
+        else:
+            stack.pop()
+            if block:
+                write("\n" + indent * len(stack))
+            write(f"</{node.__tagname__}>")
+
+
+def _count_leaves(elements: list, normalizers: dict = None) -> int:
+    return sum(
+        sum(1 for _ in element.iter_leaves()) if isinstance(element, SsmlNodeElement) else 1
+        for element in elements
+    )
+
+
+@instrumented("normalize", size=_count_leaves)
+def normalize_elements(elements: list, normalizers: dict[str, Normalizer]):
+    """
+    正则化一棵或多棵树中的所有叶子节点
+    需要Normalizer的叶子按语言分组, 每种语言只调用一次 normalize_batch
+    """
+    pending = {}
+    for element in elements:
+        leaves = element.iter_leaves() if isinstance(element, SsmlNodeElement) else [element]
+        for leaf in leaves:
+            if not leaf.uses_normalizer:
+                leaf.normalize(normalizers)
+                continue
+            lang = leaf.inherited().lang
+            if lang in normalizers:
+                pending.setdefault(lang, []).append(leaf)
+
+    for lang, leaves in pending.items():
+        results = normalizers[lang].normalize_batch([(leaf.text, leaf.attrs) for leaf in leaves])
+        for leaf, text in zip(leaves, results):
+            leaf.text = text
+
+
+class _ProcessFrame:
+    """
+    process_elements遍历中的节点: 下一个子节点的位置, 当前可合并段的起点和其可合并标签, 需要合并的区间
+    """
+    __slots__ = ("node", "index", "run_start", "merges_with", "runs")
+
+    def __init__(self, node: SsmlNodeElement):
+        self.node = node
+        self.index = 0
+        self.run_start = 0
+        self.merges_with = SsmlElement.merges_with
+        self.runs = []
+
+
+@instrumented("process", size=_count_leaves)
+def process_elements(elements: list, normalizers: dict[str, Normalizer]):
+    """
+    一次遍历完成 normalize_elements 和 merge_children: 遍历时按语言收集需要正则化的叶子,
+    同时记录每个节点中需要合并的子节点区间; 批量正则化后只对记录的区间调用merge_run, 不再遍历整棵树
+    可合并的区间只取决于标签(merges_with), 与文本无关, 所以可以在正则化之前确定
+    """
+    pending = {}
+    merges = []
+
+    def add_leaf(leaf: SsmlLeafElement):
+        if not leaf.uses_normalizer:
+            leaf.normalize(normalizers)
+            return
+        lang = leaf.inherited().lang
+        if lang in normalizers:
+            pending.setdefault(lang, []).append(leaf)
+
+    for element in elements:
+        if not isinstance(element, SsmlNodeElement):
+            add_leaf(element)
+            continue
+        # 显式栈前序遍历, 叶子的顺序与 iter_leaves 相同
+        stack = [_ProcessFrame(element)]
+        while stack:
+            frame = stack[-1]
+            children = frame.node.children
+            index = frame.index
+            while index < len(children):
+                child = children[index]
+                if child.__tagname__ not in frame.merges_with:
+                    if index - frame.run_start > 1:
+                        frame.runs.append((frame.run_start, index))
+                    frame.run_start = index
+                    frame.merges_with = child.merges_with
+                index += 1
+                if isinstance(child, SsmlNodeElement):
+                    frame.index = index
+                    stack.append(_ProcessFrame(child))
+                    break
+                add_leaf(child)
+            else:
+                if len(children) - frame.run_start > 1:
+                    frame.runs.append((frame.run_start, len(children)))
+                if frame.runs:
+                    merges.append((frame.node, frame.runs))
+                stack.pop()
+
+    for lang, leaves in pending.items():
+        results = normalizers[lang].normalize_batch([(leaf.text, leaf.attrs) for leaf in leaves])
+        for leaf, text in zip(leaves, results):
+            leaf.text = text
+
+    for node, runs in merges:
+        children = node.children
+        new_children = []
+        last = 0
+        for start, end in runs:
+            new_children.extend(children[last:start])
+            new_children.append(children[start].merge_run(children[start:end]))
+            last = end
+        new_children.extend(children[last:])
+        node.children = new_children
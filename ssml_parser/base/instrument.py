@@ -0,0 +1,127 @@
+# coding=utf-8
+"""
+可选的性能统计: 设置hook后, 解析/正则化/合并以及各interpret-as分支每次调用结束时向hook报告一个StageEvent
+未设置hook时每次调用只多一次全局变量检查; hook只在当前进程中生效
+
+with instrument.collect() as stats:
+    ...
+print(stats.summary())
+"""
+import contextlib
+import functools
+import threading
+import time
+from collections import deque
+
+
+# 当前的hook: 接收StageEvent的可调用对象, None表示关闭
+hook = None
+
+
+class StageEvent:
+    """
+    一次调用的统计: 阶段名, 耗时(秒), 输入大小(文本为字符数, 树为叶子数), 是否回退到了普通文本正则化
+    """
+    __slots__ = ("stage", "seconds", "size", "fallback")
+
+    def __init__(self, stage: str, seconds: float, size: int = None, fallback: bool = False):
+        self.stage = stage
+        self.seconds = seconds
+        self.size = size
+        self.fallback = fallback
+
+    def __repr__(self):
+        return (f"StageEvent(stage={self.stage!r}, seconds={self.seconds!r}, size={self.size!r}, "
+                f"fallback={self.fallback!r})")
+
+
+def set_hook(new_hook):
+    """
+    设置hook并返回之前的hook, new_hook为None时关闭统计
+    """
+    global hook
+    old, hook = hook, new_hook
+    return old
+
+
+@contextlib.contextmanager
+def collect(new_hook=None):
+    """
+    在with块中启用统计, 默认使用新的StageStats, 退出时恢复之前的hook
+    """
+    new_hook = new_hook if new_hook is not None else StageStats()
+    old = set_hook(new_hook)
+    try:
+        yield new_hook
+    finally:
+        set_hook(old)
+
+
+def instrumented(stage: str, size=None):
+    """
+    装饰器: hook不为空时统计被装饰函数的耗时
+    size: 可选, 参数与被装饰函数相同, 返回输入大小
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            current = hook
+            if current is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            seconds = time.perf_counter() - start
+            current(StageEvent(stage, seconds, size(*args, **kwargs) if size is not None else None))
+            return result
+        return wrapper
+    return decorator
+
+
+def _percentile(samples: list, q: float) -> float:
+    # 最近秩法, samples已排序
+    index = max(0, min(len(samples) - 1, int(q * len(samples) + 0.5) - 1))
+    return samples[index]
+
+
+class StageStats:
+    """
+    内置的汇总器: 按阶段统计调用次数, 总耗时, 输入大小, 回退次数和p50/p99耗时, 线程安全
+    max_samples: 每个阶段最多保留的最近耗时样本数, 用于计算分位数
+    """
+    def __init__(self, max_samples: int = 100000):
+        self.max_samples = max_samples
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: StageEvent):
+        with self._lock:
+            stage = self._stages.get(event.stage)
+            if stage is None:
+                stage = self._stages[event.stage] = {
+                    "count": 0, "total_s": 0.0, "size": 0, "fallbacks": 0,
+                    "samples": deque(maxlen=self.max_samples),
+                }
+            stage["count"] += 1
+            stage["total_s"] += event.seconds
+            stage["size"] += event.size or 0
+            stage["fallbacks"] += event.fallback
+            stage["samples"].append(event.seconds)
+
+    def summary(self) -> dict:
+        """
+        {阶段名: {"count", "total_s", "size", "fallbacks", "p50_ms", "p99_ms"}}
+        """
+        with self._lock:
+            stages = {name: (dict(stage), sorted(stage["samples"])) for name, stage in self._stages.items()}
+        result = {}
+        for name in sorted(stages):
+            stage, samples = stages[name]
+            del stage["samples"]
+            stage["p50_ms"] = 1000 * _percentile(samples, 0.5)
+            stage["p99_ms"] = 1000 * _percentile(samples, 0.99)
+            result[name] = stage
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
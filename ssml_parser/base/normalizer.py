@@ -5,3 +5,10 @@ class Normalizer:
     language = ""
     def normalize(self, text: str, attrs: dict = None):
         return text
+
+    def normalize_batch(self, items: list) -> list:
+        """
+        items: [(text, attrs), ...]
+        return: 与items顺序一致的正则化结果
+        """
+        return [self.normalize(text, attrs) for text, attrs in items]
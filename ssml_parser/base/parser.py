@@ -4,12 +4,27 @@ import re
 from .element import (
     SsmlElement, SsmlNodeElement, SsmlLeafElement,
     Speak, Prosody, Voice, Lang,
-    Break, PlainText, SayAs, Sub
+    Break, PlainText, SayAs, Sub, intern_attrs
 )
+from .instrument import instrumented
+from .builder import build_tree
+
+BACKENDS = ("etree", "expat")
 
 
 class SsmlParser:
-    def __init__(self):
+    def __init__(self, max_depth: int = None, backend: str = "etree"):
+        """
+        max_depth: 允许的最大嵌套深度, 超过时解析抛出ValueError, None表示不限制
+        backend: "etree" 先用ElementTree解析再转换; "expat" 由expat事件直接创建元素(参考 builder.build_tree),
+                 速度更快, 支持bytes输入, 命名空间前缀直接取自文档
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unsupported parser backend: {backend}")
+        self.max_depth = max_depth
+        self.backend = backend
+        # expat后端的限定名缓存
+        self._qualified_names = {}
         self.tags = {}
         self.namespaces = [
             {"http://www.w3.org/XML/1998/namespace": "xml"}
@@ -19,17 +34,65 @@ class SsmlParser:
         for tag in [Speak, Prosody, Voice, Lang, Break, PlainText, SayAs, Sub]:
             self.tags[tag.__tagname__] = tag
 
-    def parse(self, text: str) -> SsmlElement:
+    @instrumented("parse", size=lambda self, text: len(text))
+    def parse(self, text: str | bytes) -> SsmlElement:
+        """
+        解析SSML文本, expat后端也可以直接传入bytes
+        命名空间栈等解析状态只存在于本次调用中, 同一个解析器可以在多个线程中共用
+        """
+        if self.backend == "expat":
+            return build_tree(self, text)
         root = ET.fromstring(text)
+        namespaces = [dict(ns) for ns in self.namespaces]
         # 获取speak标签的xmlns属性
         speak_tag = re.findall(f"<speak.*?>", text)[0]
         xmlns = re.findall(f'xmlns="(.*?)"', speak_tag)
         if xmlns:
-            self.namespaces[0][xmlns[0]] = ""
-
-        return self._parse_element(None, root)
-
-    def _parse_element(self, parent: SsmlElement | None, root: ET.Element) -> SsmlElement:
+            namespaces[0][xmlns[0]] = ""
+
+        # 同一文档中相同的属性字典共用一个对象
+        attrs_table = {}
+        result = self._parse_element(None, root, namespaces, attrs_table)
+        if xmlns and isinstance(result, SsmlNodeElement):
+            result.namespaces = {"": xmlns[0]}
+        return result
+
+    def _parse_element(self, parent: SsmlElement | None, root: ET.Element, namespaces: list[dict],
+                       attrs_table: dict) -> SsmlElement:
+        # 显式栈遍历, 文档深度不受Python递归深度限制
+        result = self._create_element(parent, root, namespaces, attrs_table)
+        if not isinstance(result, SsmlNodeElement):
+            namespaces.pop(-1)
+            return result
+
+        stack = [(result, iter(root))]
+        while stack:
+            element, child_nodes = stack[-1]
+            for child_node in child_nodes:
+                child = self._create_element(element, child_node, namespaces, attrs_table)
+                element.children.append(child)
+                if child_node.tail:  # and child_node.tail.strip():
+                    tail_element = PlainText(parent=element, attrs={}, text=child_node.tail)
+                    element.children.append(tail_element)
+                if isinstance(child, SsmlNodeElement):
+                    self._check_depth(len(stack) + 1)
+                    stack.append((child, iter(child_node)))
+                    break
+                namespaces.pop(-1)
+            else:
+                stack.pop(-1)
+                namespaces.pop(-1)
+        return result
+
+    def _check_depth(self, depth: int):
+        if self.max_depth and depth > self.max_depth:
+            raise ValueError(f"SSML document is nested deeper than max_depth={self.max_depth}")
+
+    def _create_element(self, parent: SsmlElement | None, root: ET.Element, namespaces: list[dict],
+                        attrs_table: dict) -> SsmlElement:
+        """
+        创建单个元素(不包含子元素), 并把该元素的命名空间压入namespaces, 由调用方负责弹出
+        """
         tag = root.tag
         # 收集命名空间映射
         cur_ns = {}
@@ -43,9 +106,9 @@ class SsmlParser:
             if attr.startswith('xmlns:'):
                 prefix = attr.split(':')[1]
                 cur_ns[value] = prefix
-        self.namespaces.append(cur_ns)
+        namespaces.append(cur_ns)
         if tag.startswith('{'):
-            tag = self._get_prefixed_name(tag)
+            tag = self._get_prefixed_name(tag, namespaces)
         if tag not in self.tags:
             raise ValueError(f"Unsupported SSML tag: {tag}")
 
@@ -54,31 +117,21 @@ class SsmlParser:
         attrs = {}
         for attr, value in root.attrib.items():
             if attr.startswith('{'):
-                attr = self._get_prefixed_name(attr)
+                attr = self._get_prefixed_name(attr, namespaces)
             attrs[attr] = value
+        attrs = intern_attrs(attrs, attrs_table)
         # 创建元素实例
         element_class = self.tags[tag]
         if issubclass(element_class, SsmlLeafElement):
-            element = element_class(parent=parent, attrs=attrs, text=root.text)
-            return element
+            return element_class(parent=parent, attrs=attrs, text=root.text)
 
         element = element_class(parent=parent, attrs=attrs)
-        # 解析子节点
-        # children = []
         if root.text:  # and root.text.strip():
             text_element = PlainText(parent=element, attrs={}, text=root.text)
             element.children.append(text_element)
-
-        for child_node in root:
-            child = self._parse_element(element, child_node)
-            element.children.append(child)
-            if child_node.tail:  # and child_node.tail.strip():
-                tail_element = PlainText(parent=element, attrs={}, text=child_node.tail)
-                element.children.append(tail_element)
-        self.namespaces.pop(-1)
         return element
 
-    def _get_prefixed_name(self, full_name):
+    def _get_prefixed_name(self, full_name, namespaces: list[dict]):
         """将完整的URL形式的标签名转换为带前缀的形式
         ctx_ns example:
         [
@@ -97,7 +150,7 @@ class SsmlParser:
             return full_name
         namespace, tag = full_name[1:].split('}')
         # 倒序查询namespaces
-        for ns in reversed(self.namespaces):
+        for ns in reversed(namespaces):
             if namespace in ns:
                 prefix = ns[namespace]
                 return f"{prefix}:{tag}" if prefix else tag
@@ -0,0 +1,92 @@
+# coding=utf-8
+import itertools
+import multiprocessing
+from collections import deque
+from typing import Iterable, Iterator
+
+from .codec import encode_tree, decode_tree
+from .element import SsmlElement, normalize_elements, process_elements
+from .normalizer import Normalizer
+from .parser import SsmlParser
+
+
+# 每个工作进程的解析器和Normalizer, 在进程启动时初始化
+_worker_parser = None
+_worker_normalizers = None
+
+
+def _warmup(normalizers: dict[str, Normalizer]):
+    for normalizer in normalizers.values():
+        if hasattr(normalizer, "warmup"):
+            normalizer.warmup()
+
+
+def _init_worker(normalizers: dict[str, Normalizer], warmup: bool):
+    global _worker_parser, _worker_normalizers
+    if warmup:
+        _warmup(normalizers)
+    _worker_parser = SsmlParser()
+    _worker_parser.init()
+    _worker_normalizers = normalizers
+
+
+def _process_chunk(texts: list, merge: bool) -> list:
+    roots = [_worker_parser.parse(text) for text in texts]
+    if merge:
+        process_elements(roots, _worker_normalizers)
+    else:
+        normalize_elements(roots, _worker_normalizers)
+    # 元素树的pickle是递归的, 深层文档会超过递归深度限制, 编码为扁平列表后传回父进程
+    return [encode_tree(root) for root in roots]
+
+
+def normalize_documents(
+        ssml_iterable: Iterable[str],
+        normalizers: dict[str, Normalizer],
+        workers: int = None,
+        chunksize: int = 8,
+        max_pending: int = None,
+        recycle_after: int = 1000,
+        merge: bool = True,
+) -> Iterator[SsmlElement]:
+    """
+    使用进程池解析并正则化SSML文档, 按输入顺序返回结果
+    workers: 进程数, 默认为CPU核数
+    chunksize: 每个任务包含的文档数
+    max_pending: 同时提交的最大任务数, 达到上限后暂停读取输入, 默认为 workers*2
+    recycle_after: 工作进程处理约这么多文档后重启, 限制内存增长, 0表示不重启
+    merge: 正则化后是否调用 merge_children
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be positive: {chunksize}")
+    workers = workers or multiprocessing.cpu_count()
+    max_pending = max_pending or workers * 2
+    maxtasksperchild = max(1, recycle_after // chunksize) if recycle_after else None
+
+    # 支持fork时在父进程中预热, 子进程以写时复制的方式共享已构建的FST和模型
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        _warmup(normalizers)
+        worker_warmup = False
+    else:
+        context = multiprocessing.get_context()
+        worker_warmup = True
+
+    iterator = iter(ssml_iterable)
+    with context.Pool(
+            processes=workers,
+            initializer=_init_worker,
+            initargs=(normalizers, worker_warmup),
+            maxtasksperchild=maxtasksperchild,
+    ) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(itertools.islice(iterator, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.apply_async(_process_chunk, (chunk, merge)))
+            if not pending:
+                break
+            for items in pending.popleft().get():
+                yield decode_tree(items)
@@ -0,0 +1,300 @@
+# coding=utf-8
+"""
+本地正则化服务: 进程中只加载一份Normalizer(如ZhNormalizer的FST和WeTextProcessing模型),
+通过Unix socket或本机TCP接受SSML文档或叶子节点正则化请求,
+在等待窗口内把并发的请求合并成一批, 每种语言只调用一次 normalize_batch, 再把结果分别返回给各个客户端
+
+python -m ssml_parser.base.server --unix /tmp/ssml-normalizer.sock
+python -m ssml_parser.base.server --port 8765 --max-wait-ms 5 --max-batch 128
+
+协议: 每行一个JSON请求, 每行一个JSON响应, 客户端参考 ssml_parser.base.client
+"""
+import argparse
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+
+from .codec import encode_tree
+from .element import normalize_elements, process_elements
+from .normalizer import Normalizer
+from .parser import SsmlParser
+from .pool import _warmup
+
+
+class _Request:
+    __slots__ = ("kind", "payload", "future", "enqueued")
+
+    def __init__(self, kind: str, payload: tuple):
+        self.kind = kind
+        self.payload = payload
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    在一个后台线程中处理请求: 取到第一个请求后最多再等待max_wait_ms毫秒或凑满max_batch个请求, 一起处理
+    Normalizer只在该线程中调用
+    """
+    def __init__(self, normalizers: dict[str, Normalizer], max_wait_ms: float = 2.0, max_batch: int = 64):
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be positive: {max_batch}")
+        self.normalizers = normalizers
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch = max_batch
+        self._parser = SsmlParser()
+        self._parser.init()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "batches": 0, "errors": 0, "max_batch_size": 0, "max_queue_depth": 0,
+                       "wait_s": 0.0}
+        self._thread = threading.Thread(target=self._run, name="ssml-micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, kind: str, payload: tuple) -> Future:
+        """
+        kind: "ssml", payload为 (SSML文本, 是否merge_children), 结果为元素树
+              "leaves", payload为 (语言, [(text, attrs), ...]), 结果为正则化后的文本列表
+        """
+        request = _Request(kind, payload)
+        self._queue.put(request)
+        depth = self._queue.qsize()
+        with self._lock:
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], depth)
+        return request.future
+
+    def stats(self) -> dict:
+        """
+        requests/batches: 已处理的请求数和批数; mean_batch_size/max_batch_size: 每批请求数
+        queue_depth/max_queue_depth: 当前和最大排队请求数; mean_wait_ms: 请求从入队到开始处理的平均时间
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        wait_s = stats.pop("wait_s")
+        stats["queue_depth"] = self._queue.qsize()
+        stats["mean_batch_size"] = stats["requests"] / stats["batches"] if stats["batches"] else 0.0
+        stats["mean_wait_ms"] = 1000 * wait_s / stats["requests"] if stats["requests"] else 0.0
+        return stats
+
+    def close(self):
+        """
+        处理完已提交的请求后停止后台线程
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            batch = [request]
+            stop = False
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                try:
+                    request = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+            self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch: list):
+        start = time.perf_counter()
+        documents = []
+        leaf_requests = []
+        errors = 0
+        for request in batch:
+            try:
+                if request.kind == "ssml":
+                    text, merge = request.payload
+                    documents.append((request, self._parser.parse(text), merge))
+                elif request.kind == "leaves":
+                    lang, items = request.payload
+                    if lang not in self.normalizers:
+                        raise ValueError(f"No normalizer for language: {lang}")
+                    leaf_requests.append((request, lang, items))
+                else:
+                    raise ValueError(f"Unsupported request type: {request.kind}")
+            except Exception as e:
+                errors += 1
+                request.future.set_exception(e)
+
+        try:
+            results = self._normalize(documents, leaf_requests)
+        except Exception:
+            # 批量处理失败时逐个重试, 一个请求的错误输入不影响同一批中的其他请求
+            # 文档可能已被部分正则化, 重试时重新解析
+            results = []
+            for request, _, merge in documents:
+                try:
+                    results.extend(self._normalize([(request, self._parser.parse(request.payload[0]), merge)], []))
+                except Exception as e:
+                    results.append(e)
+            for leaf_request in leaf_requests:
+                try:
+                    results.extend(self._normalize([], [leaf_request]))
+                except Exception as e:
+                    results.append(e)
+        requests = [request for request, _, _ in documents] + [request for request, _, _ in leaf_requests]
+        for request, result in zip(requests, results):
+            if isinstance(result, Exception):
+                errors += 1
+                request.future.set_exception(result)
+            else:
+                request.future.set_result(result)
+
+        with self._lock:
+            stats = self._stats
+            stats["requests"] += len(batch)
+            stats["batches"] += 1
+            stats["errors"] += errors
+            stats["max_batch_size"] = max(stats["max_batch_size"], len(batch))
+            stats["wait_s"] += sum(start - request.enqueued for request in batch)
+
+    def _normalize(self, documents: list, leaf_requests: list) -> list:
+        """
+        正则化一批文档和叶子请求, 每种语言的叶子请求只调用一次 normalize_batch
+        返回与 documents + leaf_requests 顺序一致的结果
+        """
+        # 需要合并的文档用 process_elements 一次遍历完成正则化和合并
+        process_elements([root for _, root, merge in documents if merge], self.normalizers)
+        normalize_elements([root for _, root, merge in documents if not merge], self.normalizers)
+        leaf_items = {}
+        spans = []
+        for _, lang, items in leaf_requests:
+            items_of_lang = leaf_items.setdefault(lang, [])
+            spans.append((lang, len(items_of_lang), len(items_of_lang) + len(items)))
+            items_of_lang.extend(items)
+        leaf_results = {lang: self.normalizers[lang].normalize_batch(items) for lang, items in leaf_items.items()}
+        return [root for _, root, _ in documents] + [leaf_results[lang][begin:end] for lang, begin, end in spans]
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            request_id = None
+            try:
+                request = json.loads(line)
+                request_id = request.get("id")
+                response = {"id": request_id, "result": self.server.dispatch(request)}
+            except Exception as e:
+                response = {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+class _Server:
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, batcher: MicroBatcher):
+        self.batcher = batcher
+        super().__init__(address, _Handler)
+
+    def dispatch(self, request: dict):
+        kind = request.get("type")
+        if kind == "ssml":
+            root = self.batcher.submit("ssml", (request["text"], request.get("merge", True))).result()
+            return encode_tree(root)
+        if kind == "leaves":
+            items = [(text, attrs) for text, attrs in request["items"]]
+            return self.batcher.submit("leaves", (request["lang"], items)).result()
+        if kind == "stats":
+            return self.batcher.stats()
+        raise ValueError(f"Unsupported request type: {kind}")
+
+
+class _UnixServer(_Server, socketserver.ThreadingUnixStreamServer):
+    pass
+
+
+class _TCPServer(_Server, socketserver.ThreadingTCPServer):
+    pass
+
+
+class NormalizationServer:
+    """
+    address: Unix socket路径, 或 (host, port), port为0时自动选择端口
+    max_wait_ms/max_batch: 参考 MicroBatcher
+    """
+    def __init__(self, address: str | tuple, normalizers: dict[str, Normalizer], max_wait_ms: float = 2.0,
+                 max_batch: int = 64, warmup: bool = True):
+        if warmup:
+            _warmup(normalizers)
+        self.batcher = MicroBatcher(normalizers, max_wait_ms, max_batch)
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.unlink(address)
+            self._server = _UnixServer(address, self.batcher)
+        else:
+            self._server = _TCPServer(address, self.batcher)
+
+    @property
+    def address(self) -> str | tuple:
+        """
+        实际监听的地址
+        """
+        return self._server.server_address
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def start(self) -> threading.Thread:
+        """
+        在后台线程中运行服务
+        """
+        thread = threading.Thread(target=self.serve_forever, name="ssml-normalization-server", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> dict:
+        return self.batcher.stats()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self.batcher.close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    group = arg_parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--unix", help="Unix socket路径")
+    group.add_argument("--port", type=int, help="本机TCP端口")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--max-wait-ms", type=float, default=2.0, help="合并请求的等待窗口(毫秒)")
+    arg_parser.add_argument("--max-batch", type=int, default=64, help="每批最多合并的请求数")
+    args = arg_parser.parse_args()
+
+    from ssml_parser.normalizer.zh import ZhNormalizer
+    address = args.unix if args.unix else (args.host, args.port)
+    server = NormalizationServer(address, {"zh-CN": ZhNormalizer()}, args.max_wait_ms, args.max_batch)
+    print(f"Listening on {server.address}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# coding=utf-8
+from xml.parsers import expat
+
+from .builder import _qualified_name, _parse_error
+from .element import SsmlElement, SsmlNodeElement, SsmlLeafElement, PlainText, EMPTY_ATTRS, intern_attrs
+from .parser import SsmlParser
+
+# 节点中的文本在这些字符处切分, 已完整的句子不等下一个标签就返回
+SENTENCE_ENDS = "。！？；\n"
+
+
+class SsmlStreamParser:
+    """
+    增量解析SSML, 通过feed输入数据块, 与expat后端一样由expat事件直接创建元素(参考 builder.build_tree)
+    叶子节点在其结束标签到达时立即返回; 节点中的文本在句末标点(SENTENCE_ENDS)或下一个标签到达时返回,
+    因此一段文本可能被切分成多个相邻的PlainText, merge_children后与 SsmlParser.parse 的结果相同
+    返回的叶子节点已挂在其祖先节点下, 可以通过parent获取voice/prosody/lang等上下文
+
+    parser = SsmlStreamParser(ssml_parser)
+    for chunk in chunks:
+        for leaf in parser.feed(chunk):
+            ...
+    leaves = parser.close()
+    """
+    def __init__(self, parser: SsmlParser):
+        self.parser = parser
+        self.root = None
+        self._stack = []
+        # 当前节点或叶子中尚未返回的文本片段
+        self._text = []
+        # 叶子元素及其内部嵌套深度, 叶子内部的标签被忽略, 叶子的文本只取第一个子元素之前的部分
+        self._leaf = None
+        self._leaf_depth = 0
+        self._leaf_has_child = False
+        # expat名字 -> 元素类; expat的属性列表 -> 共享的属性字典
+        self._element_classes = {}
+        self._attrs_table = {}
+        # 文档中的命名空间声明 {前缀: URI}, 记录在根节点上
+        self._declared = {}
+        # 本次feed/close中完成的叶子
+        self._leaves = []
+
+        self._expat = expat.ParserCreate(namespace_separator="}")
+        self._expat.namespace_prefixes = True
+        self._expat.ordered_attributes = True
+        self._expat.buffer_text = True
+        self._expat.StartElementHandler = self._start
+        self._expat.EndElementHandler = self._end
+        self._expat.CharacterDataHandler = self._character_data
+        self._expat.StartNamespaceDeclHandler = self._start_namespace
+
+    def feed(self, data: bytes | str) -> list[SsmlLeafElement]:
+        return self._parse(data, False)
+
+    def close(self) -> list[SsmlLeafElement]:
+        return self._parse(b"", True)
+
+    def _parse(self, data: bytes | str, is_final: bool) -> list[SsmlLeafElement]:
+        try:
+            self._expat.Parse(data, is_final)
+        except expat.ExpatError as e:
+            raise _parse_error(e) from None
+        leaves = self._leaves
+        self._leaves = []
+        return leaves
+
+    def _flush_text(self, node: SsmlNodeElement, text: str):
+        if text:
+            text_element = PlainText(parent=node, attrs=EMPTY_ATTRS, text=text)
+            node.children.append(text_element)
+            self._leaves.append(text_element)
+
+    def _character_data(self, data: str):
+        if self._leaf is not None:
+            if not self._leaf_has_child:
+                self._text.append(data)
+            return
+        if not self._stack:
+            return
+        self._text.append(data)
+        end = max(data.rfind(char) for char in SENTENCE_ENDS)
+        if end < 0:
+            return
+        # 返回到最后一个句末标点为止的文本, 剩余部分继续等待
+        text = "".join(self._text)
+        split = len(text) - len(data) + end + 1
+        self._flush_text(self._stack[-1], text[:split])
+        self._text = [text[split:]] if split < len(text) else []
+
+    def _start_namespace(self, prefix: str | None, uri: str):
+        self._declared.setdefault(prefix or "", uri)
+        if self._stack:
+            self._stack[0].namespaces = self._declared
+
+    def _start(self, name: str, attributes: list):
+        if self._leaf is not None:
+            self._leaf_depth += 1
+            self._leaf_has_child = True
+            return
+
+        parent = None
+        if self._stack:
+            parent = self._stack[-1]
+            self._flush_text(parent, "".join(self._text))
+            self._text.clear()
+        element = self._create_element(parent, name, attributes)
+
+        if isinstance(element, SsmlLeafElement):
+            self._leaf = element
+            self._leaf_depth = 0
+            self._leaf_has_child = False
+            return
+        self.parser._check_depth(len(self._stack) + 1)
+        if parent is not None:
+            parent.children.append(element)
+        else:
+            self.root = element
+            if self._declared:
+                element.namespaces = self._declared
+        self._stack.append(element)
+
+    def _end(self, name: str):
+        if self._leaf is not None:
+            if self._leaf_depth:
+                self._leaf_depth -= 1
+                return
+            element = self._leaf
+            self._leaf = None
+            element.text = "".join(self._text)
+            self._text.clear()
+            if element.parent is not None:
+                element.parent.children.append(element)
+            else:
+                self.root = element
+            self._leaves.append(element)
+        else:
+            self._flush_text(self._stack.pop(), "".join(self._text))
+            self._text.clear()
+
+    def _create_element(self, parent: SsmlElement | None, name: str, attributes: list) -> SsmlElement:
+        element_class = self._element_classes.get(name)
+        if element_class is None:
+            tag = _qualified_name(name, self.parser._qualified_names)
+            element_class = self.parser.tags.get(tag)
+            if element_class is None:
+                raise ValueError(f"Unsupported SSML tag: {tag}")
+            self._element_classes[name] = element_class
+
+        attrs = EMPTY_ATTRS
+        if attributes:
+            attrs = {}
+            for i in range(0, len(attributes), 2):
+                attrs[_qualified_name(attributes[i], self.parser._qualified_names)] = attributes[i + 1]
+            attrs = intern_attrs(attrs, self._attrs_table)
+        if issubclass(element_class, SsmlLeafElement):
+            return element_class(parent=parent, attrs=attrs, text="")
+        return element_class(parent=parent, attrs=attrs)
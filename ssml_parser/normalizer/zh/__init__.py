@@ -1,12 +1,51 @@
 # coding=utf-8
 
+from ssml_parser.base.cache import MISSING, FALLBACK
 from ssml_parser.base.normalizer import Normalizer
-from .normalize import normalize
+from .normalize import normalize, normalize_batch, normalize_with_fallback, warmup, cache_version
+
+__all__ = ["ZhNormalizer", "cache_version"]
 
 class ZhNormalizer(Normalizer):
     language = "zh-CN"
 
+    def __init__(self, cache=None):
+        """
+        cache: 可选的结果缓存(如 LruResultCache), key为 (language, cache_version(), interpret-as, format, text)
+               key包含结果的版本, 语法或代码变化后持久化缓存(SqliteResultCache)中的旧结果不再命中
+        """
+        self.cache = cache
+        self._version = cache_version() if cache is not None else None
+
     def normalize(self, text: str, attrs: dict = None):
         # TODO: interpret-as
+        if self.cache is not None:
+            return self._cached_normalize(text, attrs.get("interpret-as"), attrs)
         return normalize(text, attrs.get("interpret-as"), attrs)
 
+    def normalize_batch(self, items: list) -> list:
+        if self.cache is not None:
+            return normalize_batch(items, self._cached_normalize)
+        return normalize_batch(items)
+
+    def _cached_normalize(self, text: str, interpret_as: str, attrs: dict):
+        key = (self.language, self._version, interpret_as or None, attrs.get("format") if interpret_as else None, text)
+        result = self.cache.get(key)
+        # 按值比较: 持久化缓存读出的是新的字符串对象
+        if result == FALLBACK:
+            return self._cached_normalize(text, None, {})
+        if result is not MISSING:
+            return result
+        result, fallback = normalize_with_fallback(text, interpret_as, attrs)
+        if fallback:
+            # 负缓存: 下次直接按普通文本处理, 结果只在普通文本的key下保存一份
+            self.cache.put(key, FALLBACK)
+            key = (self.language, self._version, None, None, text)
+        self.cache.put(key, result)
+        return result
+
+    def warmup(self, background: bool = False):
+        """
+        预先构建FST和WeTextProcessing模型, 参考 normalize.warmup
+        """
+        return warmup(background=background)
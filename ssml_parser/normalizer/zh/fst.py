@@ -1,15 +1,174 @@
 # coding=utf-8
 
+import abc
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import ClassVar
+
 import pynini
 from pynini.lib import pynutil
+from . import tools
 from .tools import integer_to_chinese
-from pynini.lib import pynutil
 
-class DateFst:
+
+# 预编译语法文件所在目录, 未设置时每次启动都重新编译
+FST_CACHE_DIR_ENV = "SSML_NORMALIZER_FST_DIR"
+
+
+def _grammar_hash() -> str:
+    """
+    语法源码(fst.py, tools.py)和pynini版本的hash, 用于判断预编译文件是否过期
+    """
+    h = hashlib.sha1()
+    for path in (__file__, tools.__file__):
+        with open(path, "rb") as f:
+            h.update(f.read())
+    h.update(getattr(pynini, "__version__", "").encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+GRAMMAR_VERSION = _grammar_hash()
+
+
+def _save_far(path: str, fsts: dict):
+    # 先写临时文件再rename, 避免并发启动的进程读到写了一半的文件
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pynini.Far(tmp_path, mode="w") as far:
+        for key in sorted(fsts):  # FAR要求key有序
+            far[key] = fsts[key]
+    os.replace(tmp_path, path)
+
+
+def _load_far(path: str) -> dict:
+    far = pynini.Far(path, mode="r")
+    return {key: fst for key, fst in far}
+
+
+class FormatFstCache:
+    """
+    按格式字符串缓存编译好的FST(已optimize并按输入标签arcsort)
+    线程安全, 超过maxsize时按LRU淘汰
+    """
+    def __init__(self, builder, maxsize: int = 64):
+        self._builder = builder
+        self._maxsize = maxsize
+        self._fsts = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.compile_time = 0.0
+
+    def get(self, fmt: str) -> pynini.Fst:
+        with self._lock:
+            fst = self._fsts.get(fmt)
+            if fst is not None:
+                self._fsts.move_to_end(fmt)
+                self.hits += 1
+                return fst
+            self.misses += 1
+            start = time.perf_counter()
+            fst = self._builder(fmt).optimize()
+            fst.arcsort("ilabel")
+            self.compile_time += time.perf_counter() - start
+            self._fsts[fmt] = fst
+            if self._maxsize and len(self._fsts) > self._maxsize:
+                self._fsts.popitem(last=False)
+            return fst
+
+    def register(self, formats):
+        """
+        预编译已知的格式
+        """
+        for fmt in formats:
+            self.get(fmt)
+
+    def clear(self):
+        with self._lock:
+            self._fsts.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._fsts),
+                "maxsize": self._maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "compile_time": self.compile_time,
+            }
+
+
+class _PrecompiledFst(abc.ABC):
+    """
+    支持把 default_fst, symbols_fst 和 fst_list 保存为FAR文件, 启动时直接加载
+    子类设置name(FAR文件名前缀)和format_keys(fst_list中的格式字符), 并实现_compile
+    """
+    name: ClassVar[str] = ""
+    format_keys: ClassVar[tuple] = ()
+
+    def _init_fsts(self, cache_dir: str = None):
+        if cache_dir is None:
+            cache_dir = os.environ.get(FST_CACHE_DIR_ENV)
+        if cache_dir and self.load(self.far_path(cache_dir)):
+            return
+        self._compile()
+        if cache_dir:
+            try:
+                self.save(self.far_path(cache_dir))
+            except OSError:
+                pass
+
+    @abc.abstractmethod
+    def _compile(self):
+        """
+        编译 default_fst, symbols_fst 和 fst_list
+        """
+
+    @classmethod
+    def far_path(cls, cache_dir: str) -> str:
+        return os.path.join(cache_dir, f"{cls.name}-{GRAMMAR_VERSION}.far")
+
+    def save(self, path: str):
+        fsts = {f"fst_{k}": v for k, v in self.fst_list.items()}
+        fsts["default"] = self.default_fst
+        fsts["symbols"] = self.symbols_fst
+        _save_far(path, fsts)
+
+    def load(self, path: str) -> bool:
+        """
+        从FAR文件加载, 文件不存在或不完整时返回False
+        """
+        if not os.path.exists(path):
+            return False
+        try:
+            fsts = _load_far(path)
+        except (pynini.FstIOError, pynini.FstArgError):
+            return False
+        if "default" not in fsts or "symbols" not in fsts:
+            return False
+        if any(f"fst_{k}" not in fsts for k in self.format_keys):
+            return False
+        self.fst_list = {k: fsts[f"fst_{k}"] for k in self.format_keys}
+        self.default_fst = fsts["default"]
+        self.symbols_fst = fsts["symbols"]
+        return True
+
+
+class DateFst(_PrecompiledFst):
     """
     日期FST
     """
-    def __init__(self):
+    name = "date_fst"
+    format_keys = ("m", "d", "y", "Y")
+
+    def __init__(self, cache_size: int = 64, cache_dir: str = None):
+        self._init_fsts(cache_dir)
+        self.format_cache = FormatFstCache(self._compile_fst, maxsize=cache_size)
+
+    def _compile(self):
         y2, y4 = self._init_year_fst()
         self.fst_list = {
             "m": self._init_month_fst(),
@@ -78,24 +237,26 @@ class DateFst:
         return symbols_fst.optimize()
 
     def _init_default_fst(self):
-
-        digit_to_number = {}
-        for i in range(10):
-            digit_to_number[str(i)] = str(i)
-            digit_to_number[integer_to_chinese(str(i))] = str(i)
-        year_2_fst = pynini.string_map(digit_to_number.items()).closure(2, 2) + pynini.cross("年", "").ques
-        year_4_fst = pynini.string_map(digit_to_number.items()).closure(4, 4) + pynini.cross("年", "").ques
-        year_fst = pynini.union(year_2_fst, year_4_fst) + self._init_symbols_fst().ques
+        # 复用已编译的 fst_list 和 symbols_fst
+        year_fst = pynini.union(self.fst_list["y"], self.fst_list["Y"]) + self.symbols_fst.ques
         default_fst = (
             pynutil.add_weight(year_fst, 2).ques +
             pynutil.insert(" - ") +
-            pynutil.add_weight((self._init_month_fst() + self._init_symbols_fst().ques), 0.9).ques +
+            pynutil.add_weight((self.fst_list["m"] + self.symbols_fst.ques), 0.9).ques +
             pynutil.insert(" - ") +
-            pynutil.add_weight(self._init_day_fst(), 1).ques
+            pynutil.add_weight(self.fst_list["d"], 1).ques
         )
         return default_fst.optimize()
 
     def build_fst(self, dformat: str):
+        """
+        返回格式对应的FST, 编译结果会被缓存
+        """
+        return self.format_cache.get(dformat)
+
+    def _compile_fst(self, dformat: str):
+        if not dformat:
+            raise ValueError(f"Unsupported date format: {dformat}")
         for c in dformat:
             if c not in self.fst_list:
                 raise ValueError(f"Unsupported date format: {dformat}")
@@ -106,11 +267,18 @@ class DateFst:
         return result + self.symbols_fst.star
 
 
-class TimeFst:
+class TimeFst(_PrecompiledFst):
     """
     时间FST
     """
-    def __init__(self):
+    name = "time_fst"
+    format_keys = ("h", "M", "s", "I")
+
+    def __init__(self, cache_size: int = 64, cache_dir: str = None):
+        self._init_fsts(cache_dir)
+        self.format_cache = FormatFstCache(self._compile_fst, maxsize=cache_size)
+
+    def _compile(self):
         self.fst_list = {
             "h": self._init_hour_fst(),
             "M": self._init_minute_fst(),
@@ -180,23 +348,33 @@ class TimeFst:
 
     def _init_default_fst(self):
         # 默认格式 h:MM(:ss)( period)
+        # 复用已编译的 fst_list 和 symbols_fst
+        symbols_fst = self.symbols_fst.ques
         time_fst = (
-            (self._init_period_fst() + self._init_symbols_fst().ques).ques +
+            (self.fst_list["I"] + symbols_fst).ques +
             pynutil.insert(" : ") +
-            (self._init_hour_fst() + self._init_symbols_fst().ques).ques +
+            (self.fst_list["h"] + symbols_fst).ques +
             pynutil.insert(" : ") +
-            (self._init_minute_fst() + self._init_symbols_fst().ques).ques +
+            (self.fst_list["M"] + symbols_fst).ques +
             pynutil.insert(" : ") +
             pynutil.add_weight(
-                (self._init_second_fst() + self._init_symbols_fst().ques), 1.1
+                (self.fst_list["s"] + symbols_fst), 1.1
             ).ques +
             pynutil.insert(" : ") +
-            self._init_period_fst().ques
+            self.fst_list["I"].ques
         )
         return time_fst.optimize()
 
     def build_fst(self, tformat: str):
+        """
+        返回格式对应的FST, 编译结果会被缓存
+        """
+        return self.format_cache.get(tformat)
+
+    def _compile_fst(self, tformat: str):
         # 与DateFst相同的构建逻辑
+        if not tformat:
+            raise ValueError(f"Unsupported time format: {tformat}")
         for c in tformat:
             if c not in self.fst_list:
                 raise ValueError(f"Unsupported time format: {tformat}")
@@ -207,3 +385,15 @@ class TimeFst:
         return result + self.symbols_fst.star
 
 
+def build_grammars(cache_dir: str):
+    """
+    编译并保存 DateFst/TimeFst, 返回写入的文件路径
+    """
+    paths = []
+    for fst_class in (DateFst, TimeFst):
+        grammar = fst_class.__new__(fst_class)
+        grammar._compile()
+        path = fst_class.far_path(cache_dir)
+        grammar.save(path)
+        paths.append(path)
+    return paths
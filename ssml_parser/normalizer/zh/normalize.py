@@ -1,25 +1,178 @@
 # coding=utf-8
 
+import os
 import pynini
 import pynini.lib.pynutil
 import string
-import re
+import threading
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
 
-from tn.chinese.normalizer import Normalizer as ZhNormalizer
-from .fst import DateFst, TimeFst
-from .tools import integer_to_chinese
-from . import regex
+from ssml_parser.base import instrument
+from .fst import DateFst, TimeFst, GRAMMAR_VERSION
+from .scanner import TextScanner
+from .tools import CN_DIGITS, integer_to_chinese, digits_to_chinese
+from . import regex, scanner
 
 
-date_fst = DateFst()
-time_fst = TimeFst()
-zh_tn_model = ZhNormalizer(remove_erhua=True)
+def _build_zh_tn_model():
+    from tn.chinese.normalizer import Normalizer as ZhNormalizer
+    return ZhNormalizer(remove_erhua=True)
+
+
+def _build_text_scanner():
+    import tn
+    return TextScanner(os.path.dirname(tn.__file__))
+
+
+# 重量级组件在首次使用时才构建
+_BUILDERS = {
+    "date_fst": DateFst,
+    "time_fst": TimeFst,
+    "zh_tn_model": _build_zh_tn_model,
+    "text_scanner": _build_text_scanner,
+}
+_components = {}
+_components_lock = threading.Lock()
+_ready = threading.Event()
+build_times = {}
+
+
+def _get_component(name: str):
+    component = _components.get(name)
+    if component is None:
+        with _components_lock:
+            component = _components.get(name)
+            if component is None:
+                start = time.perf_counter()
+                component = _BUILDERS[name]()
+                build_times[name] = time.perf_counter() - start
+                _components[name] = component
+    return component
+
+
+def get_date_fst() -> DateFst:
+    return _get_component("date_fst")
+
+
+def get_time_fst() -> TimeFst:
+    return _get_component("time_fst")
+
+
+def get_zh_tn_model():
+    return _get_component("zh_tn_model")
+
+
+def get_text_scanner() -> TextScanner:
+    return _get_component("text_scanner")
+
+
+def __getattr__(name):
+    # 兼容旧的模块级属性 date_fst / time_fst / zh_tn_model
+    if name in _BUILDERS:
+        return _get_component(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def warmup(background: bool = False):
+    """
+    构建所有组件
+    background=True 时在后台线程中构建并返回该线程, 否则返回各组件的构建耗时(秒)
+    """
+    if background:
+        thread = threading.Thread(target=warmup, name="zh-normalizer-warmup", daemon=True)
+        thread.start()
+        return thread
+    for name in _BUILDERS:
+        _get_component(name)
+    _ready.set()
+    return dict(build_times)
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def wait_ready(timeout: float = None) -> bool:
+    """
+    等待warmup完成, 超时返回False
+    """
+    return _ready.wait(timeout)
+
+
+def register_formats(date_formats=(), time_formats=()):
+    """
+    预编译已知的日期/时间格式
+    """
+    get_date_fst().format_cache.register(date_formats)
+    get_time_fst().format_cache.register(time_formats)
+
+
+def format_cache_stats():
+    """
+    日期/时间格式FST缓存的统计信息
+    """
+    return {
+        "date": get_date_fst().format_cache.stats(),
+        "time": get_time_fst().format_cache.stats(),
+    }
+
+
+# 普通文本按句切分的最大长度(默认不切分), 以及并行处理各块的线程数
+_chunking = {"max_chars": 0, "workers": 0, "executor": None, "pid": None}
+
+
+def set_chunking(max_chars: int = 0, workers: int = 0):
+    """
+    配置长文本的切分: 需要模型处理的文本超过max_chars时在句末标点处切分, 各块分别交给模型
+    模型在文本开头的处理与中间不同, 切分可能改变结果, 所以默认不切分(max_chars<=0)
+    workers>1 时用线程池并行处理同一文本的各块
+    """
+    with _components_lock:
+        executor = _chunking["executor"]
+        _chunking.update(max_chars=max_chars, workers=workers, executor=None, pid=None)
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def _chunk_executor():
+    if _chunking["workers"] <= 1:
+        return None
+    with _components_lock:
+        # fork出的子进程中没有父进程的线程, 需要重新创建线程池
+        if _chunking["executor"] is None or _chunking["pid"] != os.getpid():
+            _chunking["executor"] = ThreadPoolExecutor(_chunking["workers"], thread_name_prefix="zh-normalizer")
+            _chunking["pid"] = os.getpid()
+        return _chunking["executor"]
+
+
+# interpret-as分支, 其他值按普通文本处理
+_BRANCHES = frozenset(["date", "time", "phone", "nominal", "cardinal", "ordinal", "email"])
 
 
 def normalize(text: str, interpret_as: str="", attrs: dict = None):
     """
     Normalize text
+    启用统计(instrument)时报告阶段 normalize.<分支>, 日期/时间分支再区分使用的是format还是默认FST
     """
+    hook = instrument.hook
+    if hook is None:
+        return _normalize(text, interpret_as, attrs)
+    stage = "normalize." + (interpret_as if interpret_as in _BRANCHES else "plain")
+    _call_state.fallback = False
+    _call_state.fst = None
+    start = time.perf_counter()
+    result = _normalize(text, interpret_as, attrs)
+    seconds = time.perf_counter() - start
+    if _call_state.fst:
+        stage += "." + _call_state.fst
+    hook(instrument.StageEvent(stage, seconds, len(text), _call_state.fallback))
+    return result
+
+
+def _normalize(text: str, interpret_as: str, attrs: dict):
     if interpret_as == "date":
         return date_normalize(text, dformat=attrs.get("format"))
     elif interpret_as == "time":
@@ -38,11 +191,69 @@ def normalize(text: str, interpret_as: str="", attrs: dict = None):
         return plain_normalize(text)
 
 
+def cache_version() -> str:
+    """
+    正则化结果的版本: DateFst/TimeFst语法, 本模块, regex和scanner的源码以及WeTextProcessing版本的hash
+    用作持久化缓存的version, 任何一项变化后旧结果自动失效
+    """
+    h = hashlib.sha1(GRAMMAR_VERSION.encode("utf-8"))
+    for module in (__file__, regex.__file__, scanner.__file__):
+        with open(module, "rb") as f:
+            h.update(f.read())
+    try:
+        h.update(metadata.version("WeTextProcessing").encode("utf-8"))
+    except metadata.PackageNotFoundError:
+        pass
+    return h.hexdigest()[:16]
+
+
+# 记录当前线程最近一次正则化是否回退到了 plain_normalize, 以及日期/时间使用的FST(format/default)
+_call_state = threading.local()
+
+
+def _fallback_normalize(text: str):
+    _call_state.fallback = True
+    return plain_normalize(text)
+
+
+def normalize_with_fallback(text: str, interpret_as: str = "", attrs: dict = None):
+    """
+    返回 (正则化结果, 是否回退到了普通文本正则化)
+    """
+    _call_state.fallback = False
+    result = normalize(text, interpret_as, attrs)
+    return result, _call_state.fallback
+
+
+def normalize_batch(items: list, normalize_func=normalize) -> list:
+    """
+    批量正则化 items: [(text, attrs), ...]
+    按 interpret-as/format 分组, 相同输入只正则化一次
+    normalize_func: 单条正则化函数, 参数与 normalize 相同
+    """
+    groups = {}
+    keys = []
+    for text, attrs in items:
+        attrs = attrs or {}
+        group = (attrs.get("interpret-as"), attrs.get("format"))
+        groups.setdefault(group, {})[text] = None
+        keys.append((group, text))
+
+    results = {}
+    for group, texts in groups.items():
+        interpret_as, dformat = group
+        attrs = {"interpret-as": interpret_as, "format": dformat}
+        for text in texts:
+            results[(group, text)] = normalize_func(text, interpret_as, attrs)
+    return [results[key] for key in keys]
+
+
 def date_normalize(text: str, dformat: str = ""):
     """
     Normalize text
     """
     if dformat:
+        _call_state.fst = "format"
         result = date_normalize_with_format(text, dformat)
         if result:
             items = result.split("-")
@@ -53,11 +264,12 @@ def date_normalize(text: str, dformat: str = ""):
             try:
                 return build_date_str(year, month, day)
             except ValueError:
-                return plain_normalize(text)
+                return _fallback_normalize(text)
 
     # normalize date without format
+    _call_state.fst = "default"
     try:
-        result = pynini.accep(text) @ date_fst.default_fst
+        result = pynini.accep(text) @ get_date_fst().default_fst
         result = pynini.shortestpath(result).string()
         if result:
             items = result.split("-")
@@ -65,10 +277,10 @@ def date_normalize(text: str, dformat: str = ""):
             try:
                 return build_date_str(year, month, day)
             except ValueError:
-                return plain_normalize(text)
+                return _fallback_normalize(text)
     except pynini.FstOpError:
         pass
-    return plain_normalize(text)
+    return _fallback_normalize(text)
 
 
 def time_normalize(text: str, dformat: str = ""):
@@ -76,6 +288,7 @@ def time_normalize(text: str, dformat: str = ""):
     Normalize text for time expressions
     """
     if dformat:
+        _call_state.fst = "format"
         result = time_normalize_with_format(text, dformat)
         if result:
             items = result.split(":")
@@ -87,11 +300,12 @@ def time_normalize(text: str, dformat: str = ""):
             try:
                 return build_time_str(hour, minute, second, period)
             except ValueError:
-                return plain_normalize(text)
+                return _fallback_normalize(text)
 
     # normalize time without format
+    _call_state.fst = "default"
     try:
-        result = pynini.accep(text) @ time_fst.default_fst
+        result = pynini.accep(text) @ get_time_fst().default_fst
         result = pynini.shortestpath(result).string()
         if result:
             items = result.split(" : ")
@@ -101,10 +315,57 @@ def time_normalize(text: str, dformat: str = ""):
             try:
                 return build_time_str(hour, minute, second, period)
             except ValueError:
-                return plain_normalize(text)
+                return _fallback_normalize(text)
     except pynini.FstOpError:
         pass
-    return plain_normalize(text)
+    return _fallback_normalize(text)
+
+
+# 电话号码逐位读, "1"读作"幺"
+_PHONE_DIGIT_TABLE = str.maketrans({**CN_DIGITS, "1": "幺"})
+# nominal: 数字逐位读("1"和"一"读作"幺"), 字母两侧加空格, 标点替换为空格
+# 开尔文符号(U+212A)的小写是"k", 与原实现一致按字母处理
+_NOMINAL_TABLE = str.maketrans({
+    **CN_DIGITS,
+    "1": "幺",
+    "一": "幺",
+    **{c: f" {c} " for c in string.ascii_letters + "\u212a"},
+    **{c: " " for c in string.punctuation},
+})
+
+
+def _build_phone_group_plan(length: int) -> tuple:
+    """
+    电话号码按长度分组: 5位以内不分组, 4的倍数每4位一组, 否则开头分出3+3, 3或5位后剩余的按4位分组
+    返回每组的 (start, end)
+    """
+    sizes = []
+    rest = length
+    while rest > 5:
+        if rest % 4 == 0:
+            sizes += [4] * (rest // 4)
+            rest = 0
+        elif rest % 4 == 1:
+            sizes.append(5)
+            rest -= 5
+        elif rest % 4 == 2:
+            sizes += [3, 3]
+            rest -= 6
+        else:
+            sizes.append(3)
+            rest -= 3
+    if rest:
+        sizes.append(rest)
+    plan = []
+    start = 0
+    for size in sizes:
+        plan.append((start, start + size))
+        start += size
+    return tuple(plan)
+
+
+# 号码长度 -> 分组, 常见长度预先计算, 其他长度首次使用时计算
+_PHONE_GROUP_PLANS = {length: _build_phone_group_plan(length) for length in range(1, 33)}
 
 
 def telephone_normalize(text: str):
@@ -112,10 +373,7 @@ def telephone_normalize(text: str):
     Normalize text
     read by group
     """
-    numbers = regex.NUMBERS.findall(text)
-    result = " ".join(_phone_normalize(num).strip() for num in numbers)
-    result = result.replace("一", "幺")
-    return result
+    return " ".join(_phone_normalize(num) for num in regex.NUMBERS.findall(text))
     # return zh_tn_model.normalize(text)
 
 
@@ -123,19 +381,22 @@ def nominal_normalize(text: str):
     """
     Normalize text
     """
-    result = ""
-    for c in list(text):
-        if c.isdigit():
-            result += integer_to_chinese(c)
-        elif c.lower() in "qwertyuiopasdfghjklzxcvbnm":
-            result += f" {c} "
-        elif c in string.punctuation:
-            result += f" "
-        else:
-            result += c
-    result = re.sub(r"\s+", " ", result)
-    result = result.replace("一", "幺")
-    return result
+    if not text.isascii():
+        # 非ASCII的数字字符(如全角数字)无法逐位读出, 抛出ValueError(原实现抛出的是KeyError)
+        for c in text:
+            if c.isdigit() and not c.isascii():
+                integer_to_chinese(c)
+    result = text.translate(_NOMINAL_TABLE)
+    # 等价于 re.sub(r"\s+", " ", result)
+    words = result.split()
+    if not words:
+        return " " if result else ""
+    normalized = " ".join(words)
+    if result[0].isspace():
+        normalized = " " + normalized
+    if result[-1].isspace():
+        normalized += " "
+    return normalized
 
     # return " ".join(integer_to_chinese(c) if c.isdigit() else c for c in list(text))
 
@@ -147,29 +408,37 @@ def cardinal_normalize(text: str):
     try:
         return regex.CARDINAL.sub(lambda x: _cardinal_normalize(x.group(0)), text)
     except ValueError:
-        return plain_normalize(text)
+        return _fallback_normalize(text)
 
 
 def ordinal_normalize(text: str):
     """
     Normalize text
     """
-    return zh_tn_model.normalize(text)
+    return get_zh_tn_model().normalize(text)
 
 
 def email_normalize(text: str):
     """
     Normalize text
     """
-    return zh_tn_model.normalize(text)
+    return get_zh_tn_model().normalize(text)
 
 
 def plain_normalize(text: str):
     """
     Normalize text
+    不含需要正则化内容的文本只做全角转半角, 不经过模型; 其余文本整段交给模型, 较长的文本按句切分(参考 set_chunking)
     """
-    # return text
-    return zh_tn_model.normalize(text)
+    scanner = get_text_scanner()
+    if not scanner.needs_model(text):
+        return text.translate(scanner.table)
+    model = get_zh_tn_model()
+    chunks = list(scanner.chunks(text, _chunking["max_chars"]))
+    executor = _chunk_executor() if len(chunks) > 1 else None
+    if executor is not None:
+        return "".join(executor.map(model.normalize, chunks))
+    return "".join(map(model.normalize, chunks))
 
 
 def build_date_str(year: str, month: str, day: str):
@@ -178,7 +447,7 @@ def build_date_str(year: str, month: str, day: str):
     """
     result = ""
     if year:
-        result += "".join([integer_to_chinese(x) for x in year])
+        result += digits_to_chinese(year)
         result += "年"
     if month:
         if int(month) > 12:
@@ -199,7 +468,7 @@ def date_normalize_with_format(text: str, dformat: str = None):
     return: xx-xx-xx
     """
     try:
-        fst = date_fst.build_fst(dformat)
+        fst = get_date_fst().build_fst(dformat)
     except ValueError:
         return ""
     res = pynini.accep(text) @ fst
@@ -261,7 +530,7 @@ def time_normalize_with_format(text: str, tformat: str = None):
     return: xx : xx : xx
     """
     try:
-        fst = time_fst.build_fst(tformat)
+        fst = get_time_fst().build_fst(tformat)
     except ValueError:
         return ""
     res = pynini.accep(text) @ fst
@@ -288,7 +557,7 @@ def _cardinal_normalize(text: str):
     decimal_part = ("1" + decimal_part).strip("0")[1:]  # strip右边的0
     if decimal_part:
         result += "点"
-        result += "".join([integer_to_chinese(x) for x in decimal_part])
+        result += digits_to_chinese(decimal_part)
     return result
 
 
@@ -296,25 +565,8 @@ def _phone_normalize(text: str):
     """
     Normalize text
     """
-    if len(text) <= 5:
-        return "".join(integer_to_chinese(c) for c in text)
-    if len(text) % 4 == 0:
-        return " ".join(_phone_normalize(text[i:i+4]) for i in range(0, len(text), 4))
-    if len(text) % 4 == 1:
-        return "".join(integer_to_chinese(c) for c in text[:5]) + " " + _phone_normalize(text[5:])
-    if len(text) % 4 == 2:
-        return ("".join(integer_to_chinese(c) for c in text[:3]) + " " +
-                "".join(integer_to_chinese(c) for c in text[3: 6]) + " " +
-                _phone_normalize(text[6:])
-        )
-    return "".join(integer_to_chinese(c) for c in text[:3])  + " " + _phone_normalize(text[3:])
-
-
-
-
-
-
-
-
-
-
+    digits = digits_to_chinese(text, _PHONE_DIGIT_TABLE)
+    plan = _PHONE_GROUP_PLANS.get(len(text))
+    if plan is None:
+        plan = _PHONE_GROUP_PLANS.setdefault(len(text), _build_phone_group_plan(len(text)))
+    return " ".join([digits[start:end] for start, end in plan])
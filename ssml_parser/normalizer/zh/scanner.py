@@ -0,0 +1,106 @@
+# coding=utf-8
+import ast
+import glob
+import os
+import re
+
+import pynini
+
+
+# 只在和数字等一起出现时才会被规则改写的词表, 不作为触发字符
+_CONTEXT_TABLES = ("measure", "money/code", "sport")
+# 只有第一列会被匹配的词表, 只需第一个字符即可判断是否可能命中
+_PREFIX_TABLES = ("default/whitelist", "erhua/whitelist", "math/operator")
+# 切分长文本时使用的句末标点, 换行符不属于任何规则
+_SENTENCE_PUNCTUATION = "。！？；"
+
+
+def _read_column(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.rstrip("\n").split("\t")[0] for line in f if line.strip("\n")]
+
+
+class TextScanner:
+    """
+    判断普通文本是否需要经过WeTextProcessing模型
+    字符分三类:
+    - 触发字符: ASCII字符, 数字, 繁体字, 语气词, 儿化音以及白名单/运算符的首字符, 需要模型处理
+    - 分隔字符: 只会被全角转半角的标点(，。！？等), 不属于任何多字符规则
+    - 其他字符: 模型原样输出
+    不含触发字符的文本只需全角转半角, 结果与交给模型相同
+    含触发字符时要整段交给模型: 模型在文本开头的处理与中间不同, 只把其中的片段交给模型会改变结果
+    """
+    def __init__(self, tn_dir: str):
+        data_dir = os.path.join(tn_dir, "chinese", "data")
+        rules_dir = os.path.join(tn_dir, "chinese", "rules")
+
+        # 全角转半角对照表, 均为单字符到单字符
+        # 用pynini读取, 与模型对tsv的解析方式一致(如"#"之后的内容被当作注释)
+        full2half_path = os.path.join(data_dir, "char", "fullwidth_to_halfwidth.tsv")
+        full2half_fst = pynini.string_file(full2half_path)
+        full2half = {}
+        for full in _read_column(full2half_path):
+            half = pynini.shortestpath(pynini.accep(pynini.escape(full)) @ full2half_fst).string()
+            if half != full:
+                full2half[full] = half
+
+        # 规则可能用到的所有字符
+        grammar_chars = set()
+        triggers = set(chr(i) for i in range(128))
+        triggers.add("儿")
+        prefix_columns = []
+        for path in sorted(glob.glob(os.path.join(data_dir, "*", "*.tsv"))):
+            name = os.path.relpath(path, data_dir)[:-len(".tsv")].replace(os.sep, "/")
+            if name.startswith("char/charset_") or name in ("char/punctuations_zh", "char/fullwidth_to_halfwidth"):
+                continue
+            column = _read_column(path)
+            for word in column:
+                grammar_chars.update(word)
+            if name.startswith(_PREFIX_TABLES):
+                prefix_columns.append(column)
+            elif not name.startswith(_CONTEXT_TABLES):
+                # 数字, 日期, 时间, 货币符号, 繁体字, 语气词等
+                for word in column:
+                    triggers.update(word)
+        # 词条中已有触发字符(如儿化音词条中的"儿")时不需要再加首字符
+        for column in prefix_columns:
+            triggers.update(word[0] for word in column if word and triggers.isdisjoint(word))
+        # 规则源码中的字符串常量
+        for path in glob.glob(os.path.join(rules_dir, "*.py")):
+            with open(path, encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                    grammar_chars.update(c for c in node.value if ord(c) >= 128)
+
+        # 被规则用到的全角字符(如时间中的"："), 不能单独转换
+        for full in full2half:
+            if full in grammar_chars:
+                triggers.add(full)
+        self.triggers = frozenset(triggers)
+        self.separators = frozenset(c for c in full2half if c not in triggers)
+        self.table = str.maketrans({c: full2half[c] for c in self.separators})
+        # 句末标点同样必须是分隔字符, 保证切分处不在数字/日期/时间中间
+        sentence_ends = "".join(c for c in _SENTENCE_PUNCTUATION if c in self.separators) + "\n"
+        self._sentence_pattern = re.compile("[^" + re.escape(sentence_ends) + "]*(?:[" + re.escape(sentence_ends) + "]+|$)")
+
+    def needs_model(self, text: str) -> bool:
+        return not self.triggers.isdisjoint(text)
+
+    def chunks(self, text: str, max_chars: int):
+        """
+        在句末标点(。！？；和换行)处把文本切分为不超过max_chars的块, 切分处不在数字/日期/时间中间,
+        但各块交给模型的结果拼接后不一定与整段相同
+        单句超过max_chars时不再切分, max_chars<=0时不切分
+        """
+        if max_chars <= 0 or len(text) <= max_chars:
+            yield text
+            return
+        chunk = ""
+        for sentence in self._sentence_pattern.findall(text):
+            if chunk and len(chunk) + len(sentence) > max_chars:
+                yield chunk
+                chunk = ""
+            chunk += sentence
+        if chunk:
+            yield chunk
@@ -24,37 +24,81 @@ CN_BIG_UNITS = {
 }
 
 
+# 逐位读数字的str.translate表
+DIGIT_TABLE = str.maketrans(CN_DIGITS)
+
+
+def digits_to_chinese(num: str, table: dict = DIGIT_TABLE):
+    """
+    逐位读数字, 如 "2023" -> "二零二三", 结果与逐位调用 integer_to_chinese 相同
+    table: 数字到读法的str.translate表
+    """
+    if num.isascii() and num.isdigit():
+        return num.translate(table)
+    return "".join(integer_to_chinese(c) for c in num)
+
+
 def integer_to_chinese(num: str):
     """
     将数字(小于1万万亿, <10^16)转换为中文表示
+    不是ASCII数字组成的整数(包括全角数字)时抛出ValueError, 原实现对全角数字抛出的是KeyError
     """
-    try:
-        i_num = int(num)
-    except:
+    reading = _SHORT_READINGS.get(num)
+    if reading is not None:
+        return reading
+    digits = num[1:] if num[:1] == "-" else num
+    if not (digits.isascii() and digits.isdigit()):
         raise ValueError(f"num {num} is not an integer")
-    
-    result = ""
-    if num[0] == "-":
-        result += "负"
-        num = num[1:]
-    if len(num) == 1:
-        return result + CN_DIGITS[num]
-    if len(num) > 16:
-        raise ValueError(f"num {num} is bigger than 10^16")
-    
-    # split num to list every 4 digits
-    num = "0"*16 + num
-    num = num[-16:]
-    result = _i2c_8digit(num[:8])
-    if result:
-        result += CN_BIG_UNITS["亿"]
-        if num[7] == "0" or num[8] == "0":
+    if len(digits) == 1:
+        # 非负的一位数已在表中, 这里只有负数
+        return "负" + CN_DIGITS[digits]
+    if len(digits) > 16:
+        raise ValueError(f"num {digits} is bigger than 10^16")
+
+    # 按万/亿分组, 组内读法查表
+    # 开头的"一十"和结尾的"两"只在整个数字的首尾处理, 中间的组使用不同的表
+    value = int(digits)
+    if value < 10000:
+        return _GROUP_READINGS[value] or "零"
+    high, low = divmod(value, 100000000)
+    if not high:
+        return _leading_8digit(low, True)
+    result = _leading_8digit(high, False) + CN_BIG_UNITS["亿"]
+    if high % 10 == 0 or low < 10000000:
+        result += "零"
+    high, low = divmod(low, 10000)
+    if high:
+        result += _MIDDLE_GROUP_READINGS[high] + CN_BIG_UNITS["万"]
+        if low:
+            if high % 10 == 0 or low < 1000:
+                result += "零"
+            result += _TRAILING_GROUP_READINGS[low]
+    elif low:
+        result += _TRAILING_GROUP_READINGS[low]
+    return result
+
+
+def integer_to_chinese_many(nums: list[str]) -> list[str]:
+    """
+    批量转换, 结果与逐个调用 integer_to_chinese 相同
+    """
+    short_readings = _SHORT_READINGS
+    return [short_readings.get(num) or integer_to_chinese(num) for num in nums]
+
+
+def _leading_8digit(value: int, last: bool):
+    """
+    数字开头的8位以内的部分(大于0), last表示是否是整个数字的最后一部分
+    """
+    high, low = divmod(value, 10000)
+    if not high:
+        return (_GROUP_READINGS if last else _LEADING_GROUP_READINGS)[low]
+    result = _LEADING_GROUP_READINGS[high] + CN_BIG_UNITS["万"]
+    if low:
+        if high % 10 == 0 or low < 1000:
             result += "零"
-    result += _i2c_8digit(num[8:16])
-    if result:
-        return _clean_normed_number(result)
-    else:
-        return "零"
+        result += (_TRAILING_GROUP_READINGS if last else _MIDDLE_GROUP_READINGS)[low]
+    return result
 
 
 def _i2c_4digit(num: str):
@@ -107,21 +151,36 @@ def _i2c_8digit(num: str):
     return result
 
 
-def _clean_normed_number(num_str: str):
+def _clean_normed_number(num_str: str, leading: bool = True, trailing: bool = True):
     """
     清理正则化后的数字:
       - 开头的"十"
       - "二"替换成"两"
+    leading/trailing: 是否处理开头的"一十"和结尾的"两", 对万/亿分组中间的部分不处理
     """
-    if num_str.startswith("一十"):
+    if leading and num_str.startswith("一十"):
         num_str = num_str[1:]
     num_str = num_str.replace("二", "两")
     num_str = num_str.replace("十两", "十二")
     num_str = num_str.replace("两十", "二十")
-    if num_str.endswith("两"):
+    if trailing and num_str.endswith("两"):
         num_str = num_str[:-1] + "二"
     return num_str
 
+
+# 0-9999每组的读法, 下标为组的值
+_RAW_GROUP_READINGS = [_i2c_4digit(f"{i:04d}") for i in range(10000)]
+_GROUP_READINGS = [_clean_normed_number(r) for r in _RAW_GROUP_READINGS]
+_LEADING_GROUP_READINGS = [_clean_normed_number(r, trailing=False) for r in _RAW_GROUP_READINGS]
+_MIDDLE_GROUP_READINGS = [_clean_normed_number(r, False, False) for r in _RAW_GROUP_READINGS]
+_TRAILING_GROUP_READINGS = [_clean_normed_number(r, leading=False) for r in _RAW_GROUP_READINGS]
+del _RAW_GROUP_READINGS
+# 4位以内(含前导0)的数字字符串直接查表
+_SHORT_READINGS = {str(i): CN_DIGITS[str(i)] for i in range(10)}
+for _length in (2, 3, 4):
+    for _i in range(10 ** _length):
+        _SHORT_READINGS[f"{_i:0{_length}d}"] = _GROUP_READINGS[_i] or "零"
+
     
 
         
@@ -0,0 +1,32 @@
+# coding=utf-8
+"""
+多个测试文件共用的辅助函数和Normalizer
+"""
+from ssml_parser.base.element import SsmlLeafElement
+from ssml_parser.base.normalizer import Normalizer
+
+
+def dump(node):
+    """
+    把元素树转换为可以直接比较的 (类名, 属性, 文本或子节点列表)
+    """
+    if isinstance(node, SsmlLeafElement):
+        return type(node).__name__, node.attrs, node.text
+    return type(node).__name__, node.attrs, [dump(child) for child in node.children]
+
+
+class UpperNormalizer(Normalizer):
+    """
+    转换为大写, 并记录每次 normalize_batch 的输入
+    """
+    language = "en-US"
+
+    def __init__(self):
+        self.batches = []
+
+    def normalize(self, text: str, attrs: dict = None):
+        return text.upper()
+
+    def normalize_batch(self, items: list) -> list:
+        self.batches.append(items)
+        return super().normalize_batch(items)
@@ -1,5 +1,6 @@
 # coding=utf-8
 
+import pynini
 import pytest
 from ssml_parser.normalizer.zh.normalize import (
     normalize, date_normalize, time_normalize, telephone_normalize,
@@ -164,4 +165,369 @@ class TestPlainNormalize:
         # 注意：这里假设 zh_tn_model.normalize 的行为
         # 如果实际行为不同，需要调整测试用例
         result = plain_normalize(text)
-        assert result == expected
\ No newline at end of file
+        assert result == expected
+
+    def test_fast_path(self):
+        # 与整段交给模型的结果逐一比较
+        import importlib
+        import random
+        zh_normalize = importlib.import_module("ssml_parser.normalizer.zh.normalize")
+        model = zh_normalize.get_zh_tn_model()
+        plain = "今天好技术正在快速发展女声部分他说的话我们"
+        separators = "，。！？；、“”（）：　"
+        triggers = "0123456789$/%:+-=.abcXYZ万萬說儿呃￥＃ＡＢＣ１２"
+        rng = random.Random(0)
+        texts = ["今天，$51/2万", "好，$51/2万", "，$51/2萬十", "", "，，。。"]
+        for _ in range(300):
+            pool = plain + separators + (triggers if rng.random() < 0.7 else "")
+            texts.append("".join(rng.choice(pool) for _ in range(rng.randint(1, 20))))
+        for text in texts:
+            assert plain_normalize(text) == model.normalize(text), text
+
+    @pytest.mark.parametrize("max_chars, workers", [(0, 0), (10, 0), (30, 3)])
+    def test_chunking(self, max_chars, workers):
+        import importlib
+        zh_normalize = importlib.import_module("ssml_parser.normalizer.zh.normalize")
+        text = "今天是2023年10月15日，气温是25度。会议在10:30开始！\n价格为100元；比分是3:1？" * 3
+        expected = zh_normalize.get_zh_tn_model().normalize(text)
+        assert list(zh_normalize.get_text_scanner().chunks("一二。三四！五六", 3)) == ["一二。", "三四！", "五六"]
+        zh_normalize.set_chunking(max_chars, workers)
+        try:
+            assert plain_normalize(text) == expected
+        finally:
+            zh_normalize.set_chunking()
+
+    def test_chunking_disabled_by_default(self):
+        # 切分处可能改变模型的结果, 默认整段交给模型
+        import importlib
+        zh_normalize = importlib.import_module("ssml_parser.normalizer.zh.normalize")
+        text = "3" + "很" * 198 + "。$51/2万"
+        assert plain_normalize(text) == zh_normalize.get_zh_tn_model().normalize(text)
+
+class TestFormatFstCache:
+
+    def test_cache_hit(self):
+        from ssml_parser.normalizer.zh.normalize import date_fst
+        date_fst.format_cache.clear()
+        stats = date_fst.format_cache.stats()
+        fst = date_fst.build_fst("Ymd")
+        assert date_fst.build_fst("Ymd") is fst
+        new_stats = date_fst.format_cache.stats()
+        assert new_stats["misses"] == stats["misses"] + 1
+        assert new_stats["hits"] == stats["hits"] + 1
+        assert date_normalize("20231015", "Ymd") == date_normalize("20231015", "Ymd")
+
+    def test_register_and_evict(self):
+        from ssml_parser.normalizer.zh.fst import TimeFst
+        tfst = TimeFst(cache_size=2)
+        tfst.format_cache.register(["hM", "hMs", "Ih"])
+        stats = tfst.format_cache.stats()
+        assert stats["size"] == 2
+        assert stats["misses"] == 3
+        with pytest.raises(ValueError):
+            tfst.build_fst("hx")
+
+
+class TestWarmup:
+
+    def test_lazy_import(self):
+        import subprocess
+        import sys
+        code = (
+            "import importlib;"
+            "n = importlib.import_module('ssml_parser.normalizer.zh.normalize');"
+            "assert not n._components, n._components;"
+            "assert not n.is_ready()"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_warmup(self):
+        from ssml_parser.normalizer.zh import ZhNormalizer
+        import importlib
+        zh_normalize = importlib.import_module("ssml_parser.normalizer.zh.normalize")
+        thread = ZhNormalizer().warmup(background=True)
+        assert zh_normalize.wait_ready(timeout=120)
+        thread.join()
+        times = ZhNormalizer().warmup()
+        assert set(times) == {"date_fst", "time_fst", "zh_tn_model", "text_scanner"}
+
+
+class TestPrecompiledFst:
+
+    def test_build_and_load(self, tmp_path):
+        from ssml_parser.normalizer.zh.fst import DateFst, TimeFst, build_grammars
+        paths = build_grammars(str(tmp_path))
+        assert len(paths) == 2
+        date = DateFst(cache_dir=str(tmp_path))
+        assert list(date.fst_list) == ["m", "d", "y", "Y"]
+        res = pynini.accep("20231015") @ date.build_fst("Ymd")
+        assert pynini.shortestpath(res).string() == "2023-10-15"
+        time_ = TimeFst(cache_dir=str(tmp_path))
+        res = pynini.accep("12:30") @ time_.default_fst
+        assert pynini.shortestpath(res).string() == " : 12 : 30 :  : "
+
+    def test_fallback_to_compile(self, tmp_path):
+        from ssml_parser.normalizer.zh.fst import DateFst
+        path = DateFst.far_path(str(tmp_path))
+        with open(path, "wb") as f:
+            f.write(b"broken")
+        date = DateFst(cache_dir=str(tmp_path))
+        assert date.load(path)
+        assert "Y" in date.fst_list
+
+
+class TestNormalizeBatch:
+
+    def test_normalize_batch(self):
+        from ssml_parser.normalizer.zh.normalize import normalize_batch
+        items = [
+            ("2023-10-15", {"interpret-as": "date"}),
+            ("123", {"interpret-as": "cardinal"}),
+            ("2023-10-15", {"interpret-as": "date"}),
+            ("20231015", {"interpret-as": "date", "format": "Ymd"}),
+            ("123", {}),
+        ]
+        expected = [normalize(text, attrs.get("interpret-as"), attrs) for text, attrs in items]
+        assert normalize_batch(items) == expected
+
+
+class TestInstrument:
+
+    def test_stages(self):
+        from ssml_parser.base import instrument
+        events = []
+        with instrument.collect(events.append):
+            normalize("2023-10-15", "date", {})
+            normalize("20231015", "date", {"format": "Ymd"})
+            normalize("12:30", "time", {})
+            normalize("123", "cardinal", {})
+            normalize("普通文本", "", {})
+            normalize("无效日期", "date", {})
+        normalize("123", "cardinal", {})
+        assert [(event.stage, event.size, event.fallback) for event in events] == [
+            ("normalize.date.default", 10, False),
+            ("normalize.date.format", 8, False),
+            ("normalize.time.default", 5, False),
+            ("normalize.cardinal", 3, False),
+            ("normalize.plain", 4, False),
+            ("normalize.date.default", 4, True),
+        ]
+        assert all(event.seconds >= 0 for event in events)
+
+
+class TestResultCache:
+
+    def test_cached_normalizer(self):
+        from ssml_parser.base.cache import LruResultCache, FALLBACK
+        from ssml_parser.normalizer.zh import ZhNormalizer
+        cache = LruResultCache()
+        normalizer = ZhNormalizer(cache=cache)
+        uncached = ZhNormalizer()
+        items = [
+            ("2023-10-15", {"interpret-as": "date"}),
+            ("123", {"interpret-as": "cardinal"}),
+            ("无效日期", {"interpret-as": "date"}),
+            ("无效日期", {}),
+        ]
+        for _ in range(2):
+            for text, attrs in items:
+                assert normalizer.normalize(text, attrs) == uncached.normalize(text, attrs)
+        assert normalizer.normalize_batch(items) == uncached.normalize_batch(items)
+        from ssml_parser.normalizer.zh import cache_version
+        assert cache.get(("zh-CN", cache_version(), "date", None, "无效日期")) == FALLBACK
+        stats = cache.stats()
+        assert stats["entries"] == 4
+        assert stats["hits"] > 0
+
+    def test_lru_eviction(self):
+        from ssml_parser.base.cache import LruResultCache, MISSING
+        cache = LruResultCache(max_bytes=2000)
+        for i in range(100):
+            cache.put(("zh-CN", None, None, f"text{i}"), f"result{i}")
+        stats = cache.stats()
+        assert stats["bytes"] <= 2000
+        assert stats["evictions"] == 100 - stats["entries"]
+        assert cache.get(("zh-CN", None, None, "text0")) is MISSING
+        assert cache.get(("zh-CN", None, None, "text99")) == "result99"
+
+
+class TestPersistentCache:
+
+    def test_sqlite_cache(self, tmp_path):
+        from ssml_parser.base.cache import SqliteResultCache, LruResultCache, TieredResultCache, MISSING
+        from ssml_parser.normalizer.zh import ZhNormalizer, cache_version
+        path = str(tmp_path / "cache.db")
+        key = ("zh-CN", cache_version(), "cardinal", None, "123")
+        normalizer = ZhNormalizer(cache=SqliteResultCache(path))
+        assert normalizer.normalize("123", {"interpret-as": "cardinal"}) == cardinal_normalize("123")
+
+        # 另一个进程打开同一个文件
+        other = SqliteResultCache(path)
+        assert other.get(key) == cardinal_normalize("123")
+        memory = LruResultCache()
+        assert other.warm(memory) == 1
+        assert memory.get(key) == cardinal_normalize("123")
+        tiered = ZhNormalizer(cache=TieredResultCache(LruResultCache(), other))
+        assert tiered.normalize("123", {"interpret-as": "cardinal"}) == cardinal_normalize("123")
+
+        # 负缓存经过SQLite后仍然生效
+        expected = ZhNormalizer().normalize("无效日期", {"interpret-as": "date"})
+        for _ in range(3):
+            assert normalizer.normalize("无效日期", {"interpret-as": "date"}) == expected
+        tiered = ZhNormalizer(cache=TieredResultCache(LruResultCache(), SqliteResultCache(path)))
+        for _ in range(3):
+            assert tiered.normalize("无效日期", {"interpret-as": "date"}) == expected
+
+        # 其他version的缓存默认不删除已有的结果
+        stale = SqliteResultCache(path, version="old")
+        assert stale.get(key) is MISSING
+        assert stale.stats()["entries"] == 0
+        assert other.get(key) == cardinal_normalize("123")
+        SqliteResultCache(path, version="old", purge_stale=True)
+        assert other.get(key) is MISSING
+
+    def test_cache_key_version(self, tmp_path, monkeypatch):
+        # 结果的版本变化后旧的缓存结果不再命中
+        import importlib
+        from ssml_parser.base.cache import SqliteResultCache
+        from ssml_parser.normalizer.zh import ZhNormalizer
+        package = importlib.import_module("ssml_parser.normalizer.zh")
+        cache = SqliteResultCache(str(tmp_path / "cache.db"))
+        cache.put(("zh-CN", "old", "cardinal", None, "123"), "stale")
+        assert ZhNormalizer(cache=cache).normalize("123", {"interpret-as": "cardinal"}) == cardinal_normalize("123")
+        monkeypatch.setattr(package, "cache_version", lambda: "old")
+        assert ZhNormalizer(cache=cache).normalize("123", {"interpret-as": "cardinal"}) == "stale"
+
+    def test_cache_version(self, tmp_path, monkeypatch):
+        import importlib
+        module = importlib.import_module("ssml_parser.normalizer.zh.normalize")
+        version = module.cache_version()
+        for dependency in (module.regex, module.scanner):
+            changed = tmp_path / "changed.py"
+            changed.write_text("# changed\n" + open(dependency.__file__, encoding="utf-8").read(), encoding="utf-8")
+            with monkeypatch.context() as patch:
+                patch.setattr(dependency, "__file__", str(changed))
+                assert module.cache_version() != version
+        assert module.cache_version() == version
+
+    def test_sqlite_eviction(self, tmp_path):
+        from ssml_parser.base.cache import SqliteResultCache, MISSING
+        cache = SqliteResultCache(str(tmp_path / "cache.db"), max_bytes=5000)
+        for i in range(300):
+            cache.put(("zh-CN", None, None, f"text{i}"), f"result{i}")
+        cache.evict()
+        stats = cache.stats()
+        assert 5000 * 0.8 < stats["bytes"] <= 5000
+        assert stats["evictions"] == 300 - stats["entries"]
+        assert cache.get(("zh-CN", None, None, "text0")) is MISSING
+        assert cache.get(("zh-CN", None, None, "text299")) == "result299"
+
+
+def _reference_integer_to_chinese(num: str):
+    # 查表实现之前的逐位转换, 用于校验结果一致
+    from ssml_parser.normalizer.zh.tools import CN_DIGITS, _i2c_8digit, _clean_normed_number
+    int(num)
+    result = ""
+    if num[0] == "-":
+        result += "负"
+        num = num[1:]
+    if len(num) == 1:
+        return result + CN_DIGITS[num]
+    if len(num) > 16:
+        raise ValueError(f"num {num} is bigger than 10^16")
+    num = ("0" * 16 + num)[-16:]
+    result = _i2c_8digit(num[:8])
+    if result:
+        result += "亿"
+        if num[7] == "0" or num[8] == "0":
+            result += "零"
+    result += _i2c_8digit(num[8:16])
+    return _clean_normed_number(result) if result else "零"
+
+
+class TestIntegerToChinese:
+
+    def test_equivalence(self):
+        import random
+        from ssml_parser.normalizer.zh.tools import integer_to_chinese, integer_to_chinese_many
+        nums = [str(i) for i in range(100000)]
+        nums += [f"{i:0{length}d}" for length in (2, 3, 4, 5) for i in range(0, 10 ** length, 7)]
+        rng = random.Random(0)
+        for _ in range(100000):
+            length = rng.randint(5, 16)
+            # 多生成含0的数字以覆盖"零"的各种位置
+            nums.append("".join(rng.choice("0000123456789") for _ in range(length)))
+        nums += [str(10 ** i) for i in range(16)] + [str(2 * 10 ** i) for i in range(16)]
+        nums += ["-" + num for num in nums[:2000:7]] + ["9" * 16, "0" * 16]
+        expected = [_reference_integer_to_chinese(num) for num in nums]
+        assert [integer_to_chinese(num) for num in nums] == expected
+        assert integer_to_chinese_many(nums) == expected
+
+    @pytest.mark.parametrize("num", ["", "-", "abc", "1.5", "1" * 17, "0" * 17, "１２", "２"])
+    def test_invalid(self, num):
+        from ssml_parser.normalizer.zh.tools import integer_to_chinese
+        with pytest.raises(ValueError):
+            integer_to_chinese(num)
+
+
+def _reference_phone_normalize(text: str):
+    # 按长度递归分组的原实现, 用于校验结果一致
+    from ssml_parser.normalizer.zh.tools import integer_to_chinese
+    if len(text) <= 5:
+        return "".join(integer_to_chinese(c) for c in text)
+    if len(text) % 4 == 0:
+        return " ".join(_reference_phone_normalize(text[i:i+4]) for i in range(0, len(text), 4))
+    if len(text) % 4 == 1:
+        return "".join(integer_to_chinese(c) for c in text[:5]) + " " + _reference_phone_normalize(text[5:])
+    if len(text) % 4 == 2:
+        return ("".join(integer_to_chinese(c) for c in text[:3]) + " " +
+                "".join(integer_to_chinese(c) for c in text[3:6]) + " " + _reference_phone_normalize(text[6:]))
+    return "".join(integer_to_chinese(c) for c in text[:3]) + " " + _reference_phone_normalize(text[3:])
+
+
+def _reference_nominal_normalize(text: str):
+    import re
+    import string
+    from ssml_parser.normalizer.zh.tools import integer_to_chinese
+    result = ""
+    for c in text:
+        if c.isdigit():
+            result += integer_to_chinese(c)
+        elif c.lower() in "qwertyuiopasdfghjklzxcvbnm":
+            result += f" {c} "
+        elif c in string.punctuation:
+            result += " "
+        else:
+            result += c
+    return re.sub(r"\s+", " ", result).replace("一", "幺")
+
+
+class TestDigitReaders:
+
+    def test_telephone_equivalence(self):
+        import random
+        import re
+        rng = random.Random(0)
+        texts = ["".join(rng.choice("0123456789") for _ in range(length)) for length in range(1, 40)]
+        texts += ["".join(rng.choice("0123456789-+() 转") for _ in range(rng.randint(1, 30))) for _ in range(2000)]
+        for text in texts:
+            expected = " ".join(_reference_phone_normalize(num).strip() for num in re.findall(r"\d+", text))
+            assert telephone_normalize(text) == expected.replace("一", "幺")
+
+    def test_nominal_equivalence(self):
+        import random
+        import string
+        rng = random.Random(0)
+        alphabet = string.ascii_letters + string.digits + string.punctuation + " \t\n一二号楼室\u212a\u3000"
+        texts = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))) for _ in range(3000)]
+        for text in texts:
+            assert nominal_normalize(text) == _reference_nominal_normalize(text)
+
+    def test_digits_to_chinese(self):
+        from ssml_parser.normalizer.zh.tools import digits_to_chinese
+        assert digits_to_chinese("2023") == "二零二三"
+        assert digits_to_chinese("") == ""
+        with pytest.raises(ValueError):
+            digits_to_chinese("２０")
+        with pytest.raises(ValueError):
+            nominal_normalize("A２")
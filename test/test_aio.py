@@ -0,0 +1,112 @@
+# coding=utf-8
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ssml_parser.base.aio import AsyncSsmlNormalizer, normalize_ssml
+from ssml_parser.base.normalizer import Normalizer
+
+from .helpers import UpperNormalizer
+
+
+class SlowNormalizer(Normalizer):
+    language = "en-US"
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def normalize(self, text: str, attrs: dict = None):
+        with self._lock:
+            self.calls.append(text)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.seconds)
+        with self._lock:
+            self.running -= 1
+        return text
+
+
+def _doc(i) -> str:
+    return f"""<speak xml:lang="en-US">doc <say-as interpret-as="cardinal">{i}</say-as></speak>"""
+
+
+def test_normalize_ssml():
+    async def run():
+        return await asyncio.gather(*(normalize_ssml(_doc(i), {"en-US": UpperNormalizer()}) for i in range(20)))
+
+    results = asyncio.run(run())
+    for i, result in enumerate(results):
+        assert [child.text for child in result.children] == [f"DOC {i}"]
+
+
+def test_max_in_flight():
+    normalizer = SlowNormalizer(0.02)
+
+    async def run():
+        async with AsyncSsmlNormalizer({"en-US": normalizer}, workers=4, max_in_flight=2, merge=False) as runner:
+            return await asyncio.gather(*(runner.normalize_ssml(_doc(i)) for i in range(8)))
+
+    results = asyncio.run(run())
+    assert len(results) == 8
+    assert [child.text for child in results[3].children] == ["doc ", "3"]
+    assert normalizer.max_running == 2
+
+
+def test_timeout_and_cancel():
+    normalizer = SlowNormalizer(0.2)
+
+    async def run():
+        async with AsyncSsmlNormalizer({"en-US": normalizer}, workers=1) as runner:
+            with pytest.raises(TimeoutError):
+                await runner.normalize_ssml(_doc(0), timeout=0.05)
+            # 第一个文档仍在执行, 之后的调用在排队时超时或被取消
+            tasks = [asyncio.create_task(runner.normalize_ssml(_doc(i))) for i in range(1, 4)]
+            with pytest.raises(TimeoutError):
+                await runner.normalize_ssml(_doc(4), timeout=0.05)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return await runner.normalize_ssml(_doc(5))
+
+    result = asyncio.run(run())
+    assert [child.text for child in result.children] == ["doc 5"]
+    assert normalizer.calls == ["doc ", "0", "doc ", "5"]
+
+
+def test_process_executor():
+    async def run():
+        async with AsyncSsmlNormalizer({"en-US": UpperNormalizer()}, executor="process", workers=2) as runner:
+            return await asyncio.gather(*(runner.normalize_ssml(_doc(i)) for i in range(10)))
+
+    results = asyncio.run(run())
+    for i, result in enumerate(results):
+        assert [child.text for child in result.children] == [f"DOC {i}"]
+
+
+def test_process_executor_deep():
+    depth = 3000
+    ssml_text = '<speak xml:lang="en-US">' + "<voice>" * depth + "a" + "</voice>" * depth + "</speak>"
+
+    async def run():
+        async with AsyncSsmlNormalizer({"en-US": UpperNormalizer()}, executor="process", workers=1) as runner:
+            return await runner.normalize_ssml(ssml_text)
+
+    node = asyncio.run(run())
+    for _ in range(depth):
+        node = node.children[0]
+    assert node.children[0].text == "A"
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        AsyncSsmlNormalizer(executor="fiber")
+    runner = AsyncSsmlNormalizer(workers=1)
+    with pytest.raises(ValueError):
+        asyncio.run(runner.normalize_ssml(_doc(0)))
+    runner.close()
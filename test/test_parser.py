@@ -5,9 +5,11 @@ from ssml_parser.base.parser import SsmlParser
 from ssml_parser.base.element import (
     SsmlElement, SsmlNodeElement, SsmlLeafElement,
     Speak, Prosody, Voice, Lang,
-    Break, PlainText, SayAs, Sub
+    Break, PlainText, SayAs, Sub, normalize_elements, split_text
 )
 
+from .helpers import UpperNormalizer, dump
+
 
 @pytest.fixture
 def parser():
@@ -172,4 +174,493 @@ def test_invalid_tag(parser):
     with pytest.raises(ValueError) as excinfo:
         parser.parse(ssml_text)
     
-    assert "Unsupported SSML tag" in str(excinfo.value)
\ No newline at end of file
+    assert "Unsupported SSML tag" in str(excinfo.value)
+
+def test_normalize_batch(parser):
+    ssml_text = (
+        """<speak xml:lang="en-US">hello <say-as interpret-as="digits">one</say-as>"""
+        """<voice name="female">world<break time="1s"/><sub alias="alias">AI</sub></voice>"""
+        """<lang xml:lang="fr-FR">bonjour</lang></speak>"""
+    )
+    results = [parser.parse(ssml_text), parser.parse(ssml_text)]
+    normalizer = UpperNormalizer()
+    normalize_elements(results, {"en-US": normalizer})
+
+    assert len(normalizer.batches) == 1
+    assert len(normalizer.batches[0]) == 6
+    for result in results:
+        assert [leaf.text for leaf in result.iter_leaves()] == ["HELLO ", "ONE", "WORLD", "", "alias", "bonjour"]
+
+
+def test_custom_leaf_normalize(parser):
+    from ssml_parser.base.element import process_elements
+
+    # 重写了normalize的自定义叶子不参与批量正则化
+    class Phoneme(SsmlLeafElement):
+        __tagname__ = "phoneme"
+        __slots__ = ()
+
+        def normalize(self, normalizers):
+            self.text = self.attrs.get("ph", self.text)
+
+    class Emphasis(SayAs):
+        __tagname__ = "emphasis"
+        __slots__ = ()
+
+    assert not Phoneme.uses_normalizer and Emphasis.uses_normalizer
+    assert not Break.uses_normalizer and not Sub.uses_normalizer and SayAs.uses_normalizer
+    parser.tags["phoneme"] = Phoneme
+    parser.tags["emphasis"] = Emphasis
+    ssml_text = '<speak xml:lang="en-US">a<phoneme ph="pi">p</phoneme><emphasis>b</emphasis></speak>'
+    for normalize in (normalize_elements, process_elements):
+        normalizer = UpperNormalizer()
+        result = parser.parse(ssml_text)
+        normalize([result], {"en-US": normalizer})
+        assert "".join(leaf.text for leaf in result.iter_leaves()) == "ApiB"
+        assert [text for batch in normalizer.batches for text, _ in batch] == ["a", "b"]
+
+
+def test_parse_does_not_leak_namespaces(parser):
+    parser.parse("""<speak xmlns="http://www.w3.org/2001/10/synthesis">Test</speak>""")
+    assert parser.namespaces == [{"http://www.w3.org/XML/1998/namespace": "xml"}]
+
+    with pytest.raises(ValueError) as excinfo:
+        parser.parse("""<speak><s:voice xmlns:s="http://www.w3.org/2001/10/synthesis">Test</s:voice></speak>""")
+    assert "Namespace not found" in str(excinfo.value)
+
+
+def test_parse_concurrent(parser):
+    from concurrent.futures import ThreadPoolExecutor
+
+    def parse(i):
+        xmlns = f' xmlns="http://example.com/ns{i % 3}"' if i % 2 else ""
+        ssml_text = (
+            f"""<speak{xmlns} xml:lang="zh-CN">text{i}"""
+            f"""<voice name="v{i}"><prosody rate="{i}">p{i}</prosody><break time="{i}ms"/></voice>"""
+            f"""<say-as interpret-as="cardinal">{i}</say-as></speak>"""
+        )
+        result = parser.parse(ssml_text)
+        voice = result.children[1]
+        return (
+            result.attrs["xml:lang"], result.children[0].text, voice.attrs["name"],
+            voice.children[0].attrs["rate"], voice.children[0].children[0].text,
+            voice.children[1].attrs["time"], result.children[2].text,
+        )
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(parse, range(2000)))
+
+    for i, result in enumerate(results):
+        assert result == ("zh-CN", f"text{i}", f"v{i}", str(i), f"p{i}", f"{i}ms", str(i))
+    assert parser.namespaces == [{"http://www.w3.org/XML/1998/namespace": "xml"}]
+
+
+def test_stream_parse(parser):
+    from ssml_parser.base.stream import SsmlStreamParser
+
+    stream = SsmlStreamParser(parser)
+    assert stream.feed(b'<speak xml:lang="zh-CN">First sentence.') == []
+    leaves = stream.feed(b'<voice name="female">Second')
+    assert [leaf.text for leaf in leaves] == ["First sentence."]
+    leaves = stream.feed('<say-as interpret-as="digits">12</say-as>'.encode("utf-8"))
+    assert [leaf.text for leaf in leaves] == ["Second", "12"]
+    assert leaves[1].parent.attrs["name"] == "female"
+    assert leaves[1]._get_attr_in_path("xml:lang") == "zh-CN"
+    leaves = stream.feed(b'</voice>Third</speak>') + stream.close()
+    assert [leaf.text for leaf in leaves] == ["Third"]
+
+    result = stream.root
+    assert isinstance(result, Speak)
+    assert [child.tag_name() for child in result.children] == ["_plain", "voice", "_plain"]
+    assert [child.tag_name() for child in result.children[1].children] == ["_plain", "say-as"]
+
+
+def test_stream_parse_same_as_parse(parser):
+    from ssml_parser.base.stream import SsmlStreamParser
+
+    ssml_text = (
+        """<speak xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="zh-CN">"""
+        """今天是2023年10月15日。<say-as interpret-as="digits">12345</say-as>"""
+        """<voice name="female">女声<prosody rate="slow">慢速</prosody>结束</voice>"""
+        """<break time="500ms"/><sub alias="人工智能">AI</sub>技术。</speak>"""
+    )
+    data = ssml_text.encode("utf-8")
+    stream = SsmlStreamParser(parser)
+    leaves = []
+    for i in range(0, len(data), 5):
+        leaves += stream.feed(data[i:i + 5])
+    leaves += stream.close()
+
+    assert dump(stream.root) == dump(parser.parse(ssml_text))
+    assert leaves == list(stream.root.iter_leaves())
+
+
+def test_stream_parse_sentences(parser):
+    from ssml_parser.base.stream import SsmlStreamParser
+
+    # 完整的句子在所在节点结束之前返回
+    stream = SsmlStreamParser(parser)
+    leaves = stream.feed('<speak xml:lang="zh-CN">第一句。第二'.encode("utf-8"))
+    assert [leaf.text for leaf in leaves] == ["第一句。"]
+    leaves = stream.feed("句！第三句；第".encode("utf-8"))
+    assert [leaf.text for leaf in leaves] == ["第二句！第三句；"]
+    assert stream.feed("四".encode("utf-8")) == []
+    leaves = stream.feed('<voice name="female">a\nb</voice></speak>'.encode("utf-8")) + stream.close()
+    assert [leaf.text for leaf in leaves] == ["第四", "a\n", "b"]
+    assert [leaf.parent.tag_name() for leaf in leaves] == ["speak", "voice", "voice"]
+
+    ssml_text = '<speak xml:lang="zh-CN">一。二？三<voice name="v">四！五</voice>六。</speak>'
+    stream = SsmlStreamParser(parser)
+    leaves = []
+    for char in ssml_text:
+        leaves += stream.feed(char)
+    leaves += stream.close()
+    assert [leaf.text for leaf in leaves] == ["一。", "二？", "三", "四！", "五", "六。"]
+    expected = parser.parse(ssml_text)
+    expected.merge_children()
+    stream.root.merge_children()
+    assert stream.root.to_ssml() == expected.to_ssml()
+
+
+def test_iter_segments(parser):
+    ssml_text = (
+        """<speak xml:lang="zh-CN">开始<voice name="female"><prosody rate="slow">慢速。"""
+        """<voice name="male"><lang xml:lang="en-US">hello</lang></voice></prosody></voice>"""
+        """<break time="500ms"/>一二三，四五六。七八九十</speak>"""
+    )
+    result = parser.parse(ssml_text)
+    segments = list(result.iter_segments(max_chars=5))
+
+    assert [(s.text, s.lang, s.voice, s.prosody, s.break_time) for s in segments] == [
+        ("开始", "zh-CN", {}, {}, None),
+        ("慢速。", "zh-CN", {"name": "female"}, {"rate": "slow"}, None),
+        ("hello", "en-US", {"name": "male"}, {"rate": "slow"}, None),
+        ("", "zh-CN", {}, {}, "500ms"),
+        ("一二三，", "zh-CN", {}, {}, None),
+        ("四五六。", "zh-CN", {}, {}, None),
+        ("七八九十", "zh-CN", {}, {}, None),
+    ]
+
+    voice = result.children[1]
+    segments = list(voice.iter_segments(normalizers={"en-US": UpperNormalizer()}))
+    assert [(s.text, s.voice, s.lang) for s in segments] == [
+        ("慢速。", {"name": "female"}, "zh-CN"),
+        ("HELLO", {"name": "male"}, "en-US"),
+    ]
+
+
+def test_split_text():
+    assert list(split_text("abcdefgh", 3)) == ["abc", "def", "gh"]
+    assert list(split_text("ab,cdefg", 4)) == ["ab,", "cdef", "g"]
+    assert list(split_text("", 4)) == []
+    assert list(split_text("abc", 0)) == ["abc"]
+
+
+def test_compact_elements(parser):
+    import gc
+    import pickle
+
+    ssml_text = """<speak><voice name="a">x</voice><voice name="a">y<break time="1s"/></voice></speak>"""
+    result = parser.parse(ssml_text)
+    first, second = result.children
+
+    assert not hasattr(result, "__dict__")
+    assert first.attrs is second.attrs
+    assert first.children[0].attrs is second.children[0].attrs
+    with pytest.raises(TypeError):
+        first.attrs["name"] = "b"
+    assert second.children[1].parent is second
+
+    copied = pickle.loads(pickle.dumps(result))
+    assert copied.children[1].children[1].parent is copied.children[1]
+    assert copied.children[1].children[1].attrs == {"time": "1s"}
+
+    gc.collect()
+    gc.disable()
+    try:
+        del result, first, second, copied
+        assert gc.collect() == 0
+    finally:
+        gc.enable()
+
+
+def test_inherited_attrs(parser):
+    ssml_text = (
+        """<speak xml:lang="zh-CN"><voice name="a"><prosody rate="slow"><voice gender="male">"""
+        """x<say-as xml:lang="en-US">y</say-as></voice></prosody></voice></speak>"""
+    )
+    result = parser.parse(ssml_text)
+    inner = result.children[0].children[0].children[0]
+    text, say_as = inner.children
+
+    inherited = text.inherited()
+    assert inherited.lang == "zh-CN"
+    assert inherited.voice == {"name": "a", "gender": "male"}
+    assert inherited.prosody == {"rate": "slow"}
+    assert text.inherited() is inherited
+    assert inner.inherited() is inherited
+    assert say_as.inherited().lang == "en-US"
+    assert say_as.inherited().voice is inherited.voice
+
+    # 修改parent或attrs后整棵子树重新计算
+    outer = result.children[0]
+    outer.attrs = {"name": "b"}
+    assert text.inherited().voice == {"name": "b", "gender": "male"}
+    prosody = outer.children[0]
+    lang = Lang(parent=result, attrs={"xml:lang": "en-US"})
+    lang.children.append(prosody)
+    prosody.parent = lang
+    assert text.inherited().lang == "en-US"
+    assert text.inherited().voice == {"gender": "male"}
+    assert say_as.inherited().prosody == {"rate": "slow"}
+
+
+def test_detached_child_inherited_attrs(parser):
+    # 不再持有根节点时, 子树仍然使用解析时继承的属性
+    import gc
+    expat_parser = SsmlParser(backend="expat")
+    expat_parser.init()
+    ssml_text = '<speak xml:lang="en-US"><voice name="v"><prosody rate="slow">a<say-as>b</say-as></prosody></voice></speak>'
+    for ssml_parser in (parser, expat_parser):
+        voice = ssml_parser.parse(ssml_text).children[0]
+        gc.collect()
+        assert voice.parent is None
+        voice.normalize({"en-US": UpperNormalizer()})
+        leaf = voice.children[0].children[0]
+        assert [leaf.text for leaf in voice.iter_leaves()] == ["A", "B"]
+        assert leaf.inherited().lang == "en-US"
+        assert leaf.inherited().voice == {"name": "v"}
+        assert leaf.inherited().prosody == {"rate": "slow"}
+
+
+def test_parse_deep_document(parser):
+    depth = 5000
+    ssml_text = (
+        '<speak xml:lang="zh-CN">'
+        + "".join(f'<prosody rate="{i}%">a<say-as interpret-as="cardinal">{i}</say-as>' for i in range(depth))
+        + "</prosody>" * depth
+        + "</speak>"
+    )
+    result = parser.parse(ssml_text)
+    result.normalize({"zh-CN": UpperNormalizer()})
+    result.merge_children()
+
+    node = result
+    for i in range(depth):
+        node = node.children[-1]
+        assert isinstance(node, Prosody)
+        assert node.children[0].text == f"A{i}"
+    assert node.children[0].inherited().prosody == {"rate": f"{depth - 1}%"}
+
+
+def test_max_depth():
+    from ssml_parser.base.stream import SsmlStreamParser
+
+    parser = SsmlParser(max_depth=3)
+    parser.init()
+    parser.parse("<speak><voice><prosody>ok<break/></prosody></voice></speak>")
+    ssml_text = "<speak><voice><prosody><lang>too deep</lang></prosody></voice></speak>"
+    with pytest.raises(ValueError) as excinfo:
+        parser.parse(ssml_text)
+    assert "max_depth=3" in str(excinfo.value)
+    with pytest.raises(ValueError):
+        SsmlStreamParser(parser).feed(ssml_text)
+
+
+def test_merge_children_runs(parser):
+    import random
+
+    def pairwise_merge(node):
+        for child in node.children:
+            if isinstance(child, SsmlNodeElement):
+                pairwise_merge(child)
+        new_children = [node.children[0]]
+        for child in node.children[1:]:
+            if new_children[-1].can_merge(child):
+                new_children[-1] = new_children[-1].merge(child)
+            else:
+                new_children.append(child)
+        node.children = new_children
+
+    parts = [
+        "text", '<say-as interpret-as="cardinal">1</say-as>', '<sub alias="a">b</sub>',
+        '<break time="1s"/>', '<voice name="v">x<say-as>2</say-as></voice>',
+    ]
+    rng = random.Random(0)
+    for _ in range(50):
+        ssml_text = "<speak>" + "".join(rng.choice(parts) for _ in range(rng.randint(1, 30))) + "</speak>"
+        result, expected = parser.parse(ssml_text), parser.parse(ssml_text)
+        result.merge_children()
+        pairwise_merge(expected)
+        assert dump(result) == dump(expected)
+
+
+def test_instrument(parser):
+    from ssml_parser.base import instrument
+
+    ssml_text = """<speak xml:lang="en-US">hello <voice name="v">world</voice> again</speak>"""
+    assert instrument.hook is None
+    with instrument.collect() as stats:
+        results = [parser.parse(ssml_text), parser.parse(ssml_text)]
+        normalize_elements(results, {"en-US": UpperNormalizer()})
+        for result in results:
+            result.merge_children()
+    assert instrument.hook is None
+    parser.parse(ssml_text)
+
+    summary = stats.summary()
+    assert list(summary) == ["merge", "normalize", "parse"]
+    assert summary["parse"]["count"] == 2
+    assert summary["parse"]["size"] == 2 * len(ssml_text)
+    assert summary["normalize"]["count"] == 1
+    assert summary["normalize"]["size"] == 6
+    assert summary["merge"]["count"] == 2
+    for stage in summary.values():
+        assert stage["fallbacks"] == 0
+        assert 0 <= stage["p50_ms"] <= stage["p99_ms"]
+
+    stats.reset()
+    assert stats.summary() == {}
+
+
+def test_to_ssml(parser):
+    import io
+    import random
+
+    def strip_blank(root):
+        nodes = [root]
+        while nodes:
+            node = nodes.pop()
+            node.children = [child for child in node.children if child.tag_name() != "_plain" or child.text.strip()]
+            nodes.extend(child for child in node.children if isinstance(child, SsmlNodeElement))
+        return root
+
+    parts = [
+        "text", "a &amp; b &lt;c&gt; \"d\"", '<say-as interpret-as="cardinal">1</say-as>',
+        '<sub alias="a&amp;&quot;&#10;">b</sub>', '<break time="1s"/>', '<say-as interpret-as="x"/>',
+        '<voice name="v">x<say-as>2</say-as></voice>', '<prosody rate="slow"><break/></prosody>', "<lang/>",
+        '<voice name="w"><say-as>3</say-as><break/><sub alias="s">t</sub></voice>',
+    ]
+    rng = random.Random(0)
+    for _ in range(50):
+        ssml_text = ('<speak xml:lang="zh-CN">' + "".join(rng.choice(parts) for _ in range(rng.randint(1, 20)))
+                     + "</speak>")
+        root = parser.parse(ssml_text)
+        assert dump(parser.parse(root.to_ssml())) == dump(root)
+        stream = io.StringIO()
+        root.write_ssml(stream, buffer_size=3)
+        assert stream.getvalue() == root.to_ssml()
+        # pretty只在节点之间增加空白文本
+        assert dump(strip_blank(parser.parse(root.to_ssml(pretty=True)))) == dump(root)
+        root.merge_children()
+        assert dump(parser.parse(root.to_ssml())) == dump(root)
+
+    root = parser.parse('<speak><voice name="v"><break time="1s"/><prosody rate="slow">a</prosody></voice></speak>')
+    assert root.to_ssml(pretty=True) == (
+        '<speak>\n  <voice name="v">\n    <break time="1s"/>\n    <prosody rate="slow">a</prosody>\n  </voice>\n</speak>'
+    )
+    root = parser.parse('<speak><voice><say-as>1</say-as><sub alias="a">b</sub></voice></speak>')
+    assert root.to_ssml(pretty=True) == '<speak>\n  <voice><say-as>1</say-as><sub alias="a">b</sub></voice>\n</speak>'
+    namespaces = {"": "http://www.w3.org/2001/10/synthesis", "mstts": "http://www.w3.org/2001/mstts"}
+    assert root.to_ssml(namespaces=namespaces).startswith(
+        '<speak xmlns="http://www.w3.org/2001/10/synthesis" xmlns:mstts="http://www.w3.org/2001/mstts"><voice')
+    assert dump(parser.parse(root.to_ssml(namespaces=namespaces))) == dump(root)
+    with pytest.raises(ValueError):
+        Voice(parent=None, attrs={"mstts:style": "cheerful"}).to_ssml()
+    assert Voice(parent=None, attrs={"mstts:style": "cheerful"}).to_ssml(namespaces=namespaces) == (
+        '<voice mstts:style="cheerful" xmlns="http://www.w3.org/2001/10/synthesis" '
+        'xmlns:mstts="http://www.w3.org/2001/mstts"/>'
+    )
+
+    # 默认输出解析时记录的命名空间声明
+    import pickle
+    from ssml_parser.base.stream import SsmlStreamParser
+    ssml_text = ('<speak xmlns="http://www.w3.org/2001/10/synthesis" xmlns:mstts="http://www.w3.org/2001/mstts">'
+                 '<voice mstts:effect="eq">a</voice></speak>')
+    expat_parser = SsmlParser(backend="expat")
+    expat_parser.init()
+    root = expat_parser.parse(ssml_text)
+    assert root.to_ssml() == ssml_text
+    assert pickle.loads(pickle.dumps(root)).to_ssml() == ssml_text
+    assert root.children[0].to_ssml() == (
+        '<voice mstts:effect="eq" xmlns="http://www.w3.org/2001/10/synthesis" '
+        'xmlns:mstts="http://www.w3.org/2001/mstts">a</voice>'
+    )
+    stream = SsmlStreamParser(expat_parser)
+    stream.feed(ssml_text)
+    stream.close()
+    assert stream.root.to_ssml() == ssml_text
+    with pytest.raises(ValueError):
+        root.to_ssml(namespaces={})
+    ssml_text = '<speak xmlns="http://www.w3.org/2001/10/synthesis">a</speak>'
+    assert parser.parse(ssml_text).to_ssml() == ssml_text
+
+
+def test_expat_backend(parser):
+    import random
+    from ssml_parser.base.builder import build_tree
+
+    expat_parser = SsmlParser(backend="expat")
+    expat_parser.init()
+    parts = [
+        "text", "a &amp; b<!-- comment -->c", "<![CDATA[<cdata>]]>", '<say-as interpret-as="cardinal">1</say-as>',
+        '<sub alias="a&amp;b">b<break/>ignored</sub>', '<break time="1s"/>', '<say-as interpret-as="x"/>',
+        '<voice name="v" xml:lang="en-US">x<say-as>2</say-as> </voice>', '<prosody rate="slow"><break/></prosody>',
+        '<lang xml:lang="zh-CN"><voice name="v">y</voice>z</lang>',
+    ]
+    rng = random.Random(0)
+    for i in range(100):
+        xmlns = ' xmlns="http://www.w3.org/2001/10/synthesis"' if i % 2 else ""
+        ssml_text = (f'<speak{xmlns} xml:lang="zh-CN">' + "".join(rng.choice(parts) for _ in range(rng.randint(1, 20)))
+                     + "</speak>")
+        expected = dump(parser.parse(ssml_text))
+        assert dump(expat_parser.parse(ssml_text)) == expected
+        assert dump(expat_parser.parse(ssml_text.encode("utf-8"))) == expected
+    latin_text = '<?xml version="1.0" encoding="ISO-8859-1"?><speak>caf\xe9<say-as>1</say-as></speak>'
+    assert dump(expat_parser.parse(latin_text.encode("latin-1"))) == dump(parser.parse(latin_text.encode("latin-1")
+                                                                                        .decode("latin-1")))
+    assert dump(build_tree(expat_parser, "<say-as>leaf</say-as>")) == ("SayAs", {}, "leaf")
+
+    with pytest.raises(ValueError) as excinfo:
+        expat_parser.parse("<speak><invalid>Test</invalid></speak>")
+    assert "Unsupported SSML tag" in str(excinfo.value)
+    with pytest.raises(ValueError):
+        expat_parser.parse("""<speak><s:voice xmlns:s="http://www.w3.org/2001/10/synthesis">Test</s:voice></speak>""")
+    with pytest.raises(ET.ParseError) as excinfo:
+        expat_parser.parse("<speak><voice></speak>")
+    assert excinfo.value.position == (1, 16)
+    deep_parser = SsmlParser(max_depth=3, backend="expat")
+    deep_parser.init()
+    with pytest.raises(ValueError) as excinfo:
+        deep_parser.parse("<speak><voice><prosody><lang>too deep</lang></prosody></voice></speak>")
+    assert "max_depth=3" in str(excinfo.value)
+    with pytest.raises(ValueError):
+        SsmlParser(backend="lxml")
+
+
+def test_process(parser):
+    import random
+    from ssml_parser.base.element import process_elements
+
+    parts = [
+        "text", '<say-as interpret-as="cardinal">1</say-as>', '<sub alias="a">b</sub>', '<break time="1s"/>',
+        '<voice name="v">x<say-as>2</say-as><sub alias="c">d</sub></voice>', '<lang xml:lang="fr-FR">y<sub>z</sub></lang>',
+        '<prosody rate="slow"><say-as>3</say-as></prosody>', "<voice/>",
+    ]
+    rng = random.Random(0)
+    for _ in range(100):
+        ssml_text = ('<speak xml:lang="en-US">' + "".join(rng.choice(parts) for _ in range(rng.randint(1, 30)))
+                     + "</speak>")
+        expected_normalizer, normalizer = UpperNormalizer(), UpperNormalizer()
+        expected = [parser.parse(ssml_text), parser.parse(ssml_text)]
+        normalize_elements(expected, {"en-US": expected_normalizer})
+        for root in expected:
+            root.merge_children()
+        results = [parser.parse(ssml_text), parser.parse(ssml_text)]
+        process_elements(results, {"en-US": normalizer})
+        assert [dump(root) for root in results] == [dump(root) for root in expected]
+        assert normalizer.batches == expected_normalizer.batches
+
+    result = parser.parse('<speak xml:lang="en-US">a<say-as>b</say-as><break/>c</speak>')
+    result.process({"en-US": UpperNormalizer()})
+    assert [(child.tag_name(), child.text) for child in result.children] == [("_plain", "AB"), ("break", ""), ("_plain", "C")]
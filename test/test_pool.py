@@ -0,0 +1,33 @@
+# coding=utf-8
+
+from ssml_parser.base.pool import normalize_documents
+
+from .helpers import UpperNormalizer
+
+
+def test_normalize_documents_order():
+    docs = (f"""<speak xml:lang="en-US">doc <say-as interpret-as="cardinal">{i}</say-as></speak>""" for i in range(50))
+    results = list(normalize_documents(docs, {"en-US": UpperNormalizer()}, workers=2, chunksize=3, recycle_after=6))
+
+    assert len(results) == 50
+    for i, result in enumerate(results):
+        assert len(result.children) == 1
+        assert result.children[0].text == f"DOC {i}"
+
+
+def test_normalize_documents_without_merge():
+    docs = ["""<speak xml:lang="en-US">a<break time="1s"/>b</speak>"""]
+    results = list(normalize_documents(docs, {"en-US": UpperNormalizer()}, workers=1, merge=False))
+
+    assert [child.text for child in results[0].children] == ["A", "", "B"]
+
+
+def test_normalize_documents_deep():
+    depth = 3000
+    docs = ['<speak xml:lang="en-US">' + "<voice>" * depth + "a" + "</voice>" * depth + "</speak>"]
+    results = list(normalize_documents(docs, {"en-US": UpperNormalizer()}, workers=1))
+
+    node = results[0]
+    for _ in range(depth):
+        node = node.children[0]
+    assert node.children[0].text == "A"
@@ -0,0 +1,134 @@
+# coding=utf-8
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ssml_parser.base.client import NormalizerClient, RemoteNormalizer
+from ssml_parser.base.codec import encode_tree, decode_tree
+from ssml_parser.base.element import normalize_elements
+from ssml_parser.base.parser import SsmlParser
+from ssml_parser.base.server import MicroBatcher, NormalizationServer
+
+from .helpers import UpperNormalizer, dump
+
+
+@pytest.fixture
+def parser():
+    parser = SsmlParser()
+    parser.init()
+    return parser
+
+
+@pytest.fixture(params=["unix", "tcp"])
+def server(request, tmp_path):
+    address = str(tmp_path / "normalizer.sock") if request.param == "unix" else ("127.0.0.1", 0)
+    server = NormalizationServer(address, {"en-US": UpperNormalizer()}, max_wait_ms=20, max_batch=16)
+    server.start()
+    yield server
+    server.close()
+
+
+def _doc(i) -> str:
+    return (f"""<speak xml:lang="en-US">doc <say-as interpret-as="cardinal">{i}</say-as>"""
+            f"""<voice name="v"><break time="1s"/>voice {i}</voice></speak>""")
+
+
+def test_encode_tree(parser):
+    root = parser.parse(_doc(1))
+    decoded = decode_tree(encode_tree(root))
+    assert dump(decoded) == dump(root)
+    assert decoded.children[2].children[0].parent is decoded.children[2]
+    ssml_text = '<speak xmlns="http://www.w3.org/2001/10/synthesis">a</speak>'
+    assert decode_tree(encode_tree(parser.parse(ssml_text))).to_ssml() == ssml_text
+
+    # 自定义标签需要传入解析时使用的标签表
+    from ssml_parser.base.element import SsmlLeafElement
+
+    class Phoneme(SsmlLeafElement):
+        __tagname__ = "phoneme"
+        __slots__ = ()
+
+    parser.tags["phoneme"] = Phoneme
+    items = encode_tree(parser.parse('<speak>a<phoneme ph="pi">p</phoneme></speak>'))
+    with pytest.raises(ValueError) as excinfo:
+        decode_tree(items)
+    assert "phoneme" in str(excinfo.value)
+    assert type(decode_tree(items, parser.tags).children[1]) is Phoneme
+
+
+def test_normalize_ssml(server, parser):
+    with NormalizerClient(server.address) as client:
+        for merge in (True, False):
+            expected = parser.parse(_doc(7))
+            normalize_elements([expected], {"en-US": UpperNormalizer()})
+            if merge:
+                expected.merge_children()
+            assert dump(client.normalize_ssml(_doc(7), merge=merge)) == dump(expected)
+        assert client.normalize_leaves([("a", {}), ("b", {"interpret-as": "cardinal"})], "en-US") == ["A", "B"]
+
+        with pytest.raises(ValueError) as excinfo:
+            client.normalize_ssml("<speak><invalid>Test</invalid></speak>")
+        assert "Unsupported SSML tag" in str(excinfo.value)
+        with pytest.raises(ValueError) as excinfo:
+            client.normalize_leaves([("a", {})], "fr-FR")
+        assert "fr-FR" in str(excinfo.value)
+        # 出错后连接仍可以继续使用
+        assert client.normalize_leaves([("c", None)], "en-US") == ["C"]
+
+
+def test_micro_batching(server):
+    normalizer = RemoteNormalizer(server.address, "en-US")
+
+    def run(i):
+        with NormalizerClient(server.address) as client:
+            root = client.normalize_ssml(_doc(i))
+        leaves = normalizer.normalize_batch([(f"leaf {i}", {})])
+        return [child.text for child in root.children if child.tag_name() != "voice"], leaves
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(run, range(64)))
+    for i, (texts, leaves) in enumerate(results):
+        assert texts == [f"DOC {i}"]
+        assert leaves == [f"LEAF {i}"]
+
+    with NormalizerClient(server.address) as client:
+        stats = client.stats()
+    assert stats["requests"] == 128
+    assert stats["errors"] == 0
+    assert stats["batches"] < 128
+    assert 1 < stats["max_batch_size"] <= 16
+    assert stats["mean_batch_size"] == 128 / stats["batches"]
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] >= 1
+
+
+class FailingNormalizer(UpperNormalizer):
+
+    def normalize(self, text: str, attrs: dict = None):
+        if "bad" in text:
+            raise ValueError(f"bad input: {text}")
+        return super().normalize(text, attrs)
+
+
+def test_error_isolation():
+    # 同一批中一个请求出错不影响其他请求
+    normalizer = FailingNormalizer()
+    batcher = MicroBatcher({"en-US": normalizer}, max_wait_ms=200)
+    try:
+        futures = [
+            batcher.submit("ssml", (_doc(1), True)),
+            batcher.submit("ssml", ("""<speak xml:lang="en-US">a<say-as>bad</say-as></speak>""", True)),
+            batcher.submit("leaves", ("en-US", [("good", {})])),
+            batcher.submit("leaves", ("en-US", [("x", {}), ("bad", {})])),
+        ]
+        assert futures[0].result().children[0].text == "DOC 1"
+        with pytest.raises(ValueError):
+            futures[1].result()
+        assert futures[2].result() == ["GOOD"]
+        with pytest.raises(ValueError):
+            futures[3].result()
+        stats = batcher.stats()
+        assert stats["batches"] == 1
+        assert stats["errors"] == 2
+    finally:
+        batcher.close()